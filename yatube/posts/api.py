@@ -0,0 +1,256 @@
+import json
+from functools import wraps
+
+from django.core.files.storage import default_storage
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+from posts import batch
+from posts.cache import (get_cached_page, group_scope, index_scope,
+                         profile_scope, user_scope)
+from posts.conditional import check_modified, conditional_page
+from posts.models import Group, Post, User
+from posts.paginator import CursorPaginator
+from posts.routers import read_replica
+from posts.settings import (API_BATCH_SIZE, API_COMPRESS_MIN_SIZE,
+                            API_JSON_PARAMS, COMMENTS_PER_PAGE)
+from posts.views import get_feed_paginator
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+POST_FIELDS = {
+    "id": "id",
+    "text": "text",
+    "pub_date": "pub_date",
+    "author": "author__username",
+    "group": "group__slug",
+    "image": "image",
+    "comment_count": "comment_count",
+}
+COMMENT_FIELDS = {
+    "id": "id",
+    "author": "author__username",
+    "text": "text",
+    "created": "created",
+}
+
+
+class ApiError(Exception):
+    def __init__(self, status, detail):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+def accepted_encodings(request):
+    return {
+        part.split(";")[0].strip().lower()
+        for part in request.META.get("HTTP_ACCEPT_ENCODING", "").split(",")
+    }
+
+
+def compress(request, response):
+    if (response.streaming or response.has_header("Content-Encoding") or
+            len(response.content) < API_COMPRESS_MIN_SIZE):
+        return response
+    patch_vary_headers(response, ("Accept-Encoding", ))
+    encodings = accepted_encodings(request)
+    if brotli is not None and "br" in encodings:
+        encoding, content = "br", brotli.compress(response.content)
+    elif "gzip" in encodings:
+        encoding, content = "gzip", compress_string(response.content)
+    else:
+        return response
+    if len(content) >= len(response.content):
+        return response
+    response.content = content
+    response["Content-Length"] = str(len(content))
+    response["Content-Encoding"] = encoding
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response["ETag"] = "W/" + etag
+    return response
+
+
+def api_endpoint(*methods):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                response = JsonResponse({"detail": "Method not allowed."},
+                                        status=405)
+                response["Allow"] = ", ".join(methods)
+                return response
+            try:
+                response = view(request, *args, **kwargs)
+            except Http404:
+                response = JsonResponse({"detail": "Not found."},
+                                        status=404)
+            except ApiError as error:
+                response = JsonResponse({"detail": error.detail},
+                                        status=error.status)
+            return compress(request, response)
+        return wrapper
+    return decorator
+
+
+api_view = api_endpoint("GET", "HEAD")
+
+
+def require_user(request):
+    if not request.user.is_authenticated:
+        raise ApiError(401, "Authentication required.")
+
+
+def batch_items(request):
+    try:
+        items = json.loads(request.body)["items"]
+    except (ValueError, KeyError, TypeError) as error:
+        raise ApiError(
+            400, 'Expected a JSON object with an "items" list.'
+        ) from error
+    if not isinstance(items, list) or not items:
+        raise ApiError(400, '"items" must be a non-empty list.')
+    if len(items) > API_BATCH_SIZE:
+        raise ApiError(400, f"At most {API_BATCH_SIZE} items per batch.")
+    return items
+
+
+def select_fields(request, schema):
+    requested = request.GET.get("fields")
+    if not requested:
+        return schema
+    names = [name.strip() for name in requested.split(",") if name.strip()]
+    unknown = [name for name in names if name not in schema]
+    if unknown:
+        raise ApiError(400, "Unknown fields: " + ", ".join(unknown))
+    return {name: schema[name] for name in names}
+
+
+def query_paths(fields, *required):
+    return list(dict.fromkeys((*fields.values(), "id", *required)))
+
+
+def serialize(rows, fields):
+    items = [{name: row[path] for name, path in fields.items()}
+             for row in rows]
+    if "image" in fields:
+        for item in items:
+            item["image"] = (default_storage.url(item["image"])
+                             if item["image"] else None)
+    return items
+
+
+def respond(data):
+    return JsonResponse(data, json_dumps_params=API_JSON_PARAMS)
+
+
+def page_response(page, fields):
+    return respond({
+        "results": serialize(page, fields),
+        "next": page.next_cursor,
+        "previous": page.previous_cursor,
+    })
+
+
+def feed_response(request, posts, scope=None, follower=None):
+    fields = select_fields(request, POST_FIELDS)
+    paths = query_paths(fields, "pub_date")
+    paginator = get_feed_paginator(posts.values(*paths), follower=follower)
+    cursor = request.GET.get("cursor")
+    if scope is None:
+        page = paginator.get_page(cursor)
+    else:
+        page = get_cached_page(paginator, cursor, scope,
+                               "api:" + ",".join(paths) + ":")
+    return page_response(page, fields)
+
+
+@api_view
+@read_replica
+@conditional_page
+def index(request):
+    check_modified(request, index_scope())
+    return feed_response(request, Post.objects.for_feed(), index_scope())
+
+
+@api_view
+@read_replica
+def follow_index(request):
+    require_user(request)
+    return feed_response(request, Post.objects.for_feed(),
+                         follower=request.user)
+
+
+@api_view
+@read_replica
+@conditional_page
+def group_posts(request, slug):
+    group = get_object_or_404(Group.objects.only("pk"), slug=slug)
+    scope = group_scope(group.pk)
+    check_modified(request, scope)
+    return feed_response(request, group.posts.for_feed(), scope)
+
+
+@api_view
+@read_replica
+@conditional_page
+def profile(request, username):
+    author = get_object_or_404(User.objects.only("pk"), username=username)
+    scope = profile_scope(author.pk)
+    check_modified(request, scope, user_scope(author.pk))
+    return feed_response(request, author.posts.for_feed(), scope)
+
+
+@api_view
+@read_replica
+@conditional_page
+def post_view(request, username, post_id):
+    fields = select_fields(request, POST_FIELDS)
+    post = get_object_or_404(
+        Post.objects.values(*query_paths(fields, "author_id")),
+        author__username=username, pk=post_id
+    )
+    check_modified(request, profile_scope(post["author_id"]),
+                   user_scope(post["author_id"]))
+    return respond(serialize((post, ), fields)[0])
+
+
+@api_view
+@read_replica
+def post_comments(request, username, post_id):
+    fields = select_fields(request, COMMENT_FIELDS)
+    post = get_object_or_404(Post.objects.only("pk"), pk=post_id,
+                             author__username=username)
+    comments = post.comments.values(*query_paths(fields, "created"))
+    paginator = CursorPaginator(comments, COMMENTS_PER_PAGE, key="created")
+    return page_response(paginator.get_page(request.GET.get("cursor")),
+                         fields)
+
+
+def batch_response(results):
+    created = sum(result["status"] == "created" for result in results)
+    return respond({
+        "created": created,
+        "invalid": len(results) - created,
+        "results": results,
+    })
+
+
+@api_endpoint("POST")
+def create_posts(request):
+    require_user(request)
+    return batch_response(batch.create_posts(request.user,
+                                             batch_items(request)))
+
+
+@api_endpoint("POST")
+def create_comments(request):
+    require_user(request)
+    return batch_response(batch.create_comments(request.user,
+                                                batch_items(request)))
@@ -0,0 +1,17 @@
+from django.urls import path
+
+from posts import api
+
+app_name = "api"
+
+urlpatterns = [
+    path("", api.index, name="index"),
+    path("follow/", api.follow_index, name="follow_index"),
+    path("batch/posts/", api.create_posts, name="create_posts"),
+    path("batch/comments/", api.create_comments, name="create_comments"),
+    path("group/<slug:slug>/", api.group_posts, name="group"),
+    path("<str:username>/", api.profile, name="profile"),
+    path("<str:username>/<int:post_id>/", api.post_view, name="post"),
+    path("<str:username>/<int:post_id>/comments/", api.post_comments,
+         name="post_comments"),
+]
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class PostsConfig(AppConfig):
     name = "posts"
+
+    def ready(self):
+        import posts.checks  # noqa
+        import posts.db  # noqa
+        import posts.signals  # noqa
@@ -0,0 +1,107 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.shortcuts import get_object_or_404, render
+
+from posts import metrics
+from posts.cache import (feed_fragment, get_cached_page, index_scope,
+                         profile_scope, user_scope)
+from posts.conditional import check_modified, conditional_page
+from posts.forms import CommentForm
+from posts.models import Post, User
+from posts.routers import read_replica
+from posts.settings import ASYNC_PARALLEL_QUERIES
+from posts.views import (get_comments_page, get_feed_paginator,
+                         is_user_subscribed)
+
+
+def call_instrumented(function, args, kwargs):
+    try:
+        with metrics.instrument():
+            return function(*args, **kwargs)
+    finally:
+        if ASYNC_PARALLEL_QUERIES:
+            close_old_connections()
+
+
+def run_query(function, *args, **kwargs):
+    return sync_to_async(
+        call_instrumented, thread_sensitive=not ASYNC_PARALLEL_QUERIES
+    )(function, args, kwargs)
+
+
+def approximate_count(paginator):
+    return paginator.count
+
+
+def render_feed(request, template, context, scope):
+    context["feed_cache"] = feed_fragment(request, context["page"], scope)
+    return render(request, template, context)
+
+
+async def get_feed_page(request, posts, scope):
+    paginator = get_feed_paginator(posts)
+    page, count = await asyncio.gather(
+        run_query(get_cached_page, paginator, request.GET.get("cursor"),
+                  scope),
+        run_query(approximate_count, paginator)
+    )
+    return paginator, page
+
+
+@read_replica
+@conditional_page
+async def index(request):
+    scope = index_scope()
+    await run_query(check_modified, request, scope)
+    paginator, page = await get_feed_page(request, Post.objects.for_feed(),
+                                          scope)
+    return await run_query(render_feed, request, "index.html", {
+        "page": page,
+        "paginator": paginator
+    }, scope)
+
+
+@read_replica
+@conditional_page
+async def profile(request, username):
+    author = await run_query(
+        get_object_or_404, User.objects.select_related("stats"),
+        username=username
+    )
+    scope = profile_scope(author.pk)
+    await run_query(check_modified, request, scope, user_scope(author.pk))
+    (paginator, page), following = await asyncio.gather(
+        get_feed_page(request, author.posts.for_feed(), scope),
+        run_query(is_user_subscribed, request.user, author)
+    )
+    return await run_query(render_feed, request, "posts/profile.html", {
+        "page": page,
+        "paginator": paginator,
+        "author": author,
+        "following": following
+    }, scope)
+
+
+@read_replica
+@conditional_page
+async def post_view(request, username, post_id):
+    post = await run_query(
+        get_object_or_404,
+        Post.objects.for_feed().select_related("author__stats"),
+        author__username=username, pk=post_id
+    )
+    await run_query(check_modified, request, profile_scope(post.author_id),
+                    user_scope(post.author_id))
+    comments, following = await asyncio.gather(
+        run_query(get_comments_page, request, post.comments.all()),
+        run_query(is_user_subscribed, request.user, post.author)
+    )
+    return await run_query(render, request, "posts/post.html", {
+        "author": post.author,
+        "post": post,
+        "comments": comments,
+        "form": CommentForm(),
+        "following": following
+    })
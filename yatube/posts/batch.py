@@ -0,0 +1,95 @@
+from collections import Counter
+
+from django.db import connections, router, transaction
+
+from posts import search, timeline
+from posts.cache import bump_feed_version, post_scopes
+from posts.counters import bump_comment_count, bump_user_stats
+from posts.forms import CommentForm, PostForm
+from posts.models import Comment, Post
+
+
+def validate(forms):
+    results, valid = [], []
+    for index, form in enumerate(forms):
+        if form.is_valid():
+            results.append({"index": index, "status": "created"})
+            valid.append((form, results[-1]))
+        else:
+            results.append({"index": index, "status": "invalid",
+                            "errors": form.errors.get_json_data()})
+    return results, valid
+
+
+def insert(model, objects, owner):
+    created = model.objects.bulk_create(objects)
+    db = router.db_for_write(model)
+    features = connections[db].features
+    if created and not features.can_return_rows_from_bulk_insert:
+        ids = model.objects.using(db).filter(**owner).order_by(
+            "-pk").values_list("pk", flat=True)[:len(created)]
+        for obj, pk in zip(created, reversed(ids)):
+            obj.pk = pk
+    return created
+
+
+def create_posts(author, items):
+    results, valid = validate(
+        PostForm(item if isinstance(item, dict) else {}) for item in items
+    )
+    posts = []
+    for form, result in valid:
+        post = form.save(commit=False)
+        post.author = author
+        posts.append(post)
+    with transaction.atomic():
+        posts = insert(Post, posts, {"author": author})
+        if posts:
+            search.index_posts(Post.objects.filter(pk__in=[
+                post.pk for post in posts
+            ]))
+            bump_user_stats(author.pk, "posts_count", len(posts))
+            timeline.fan_out_posts(author.pk, posts)
+    if posts:
+        bump_feed_version(*post_scopes(
+            author.pk, *{post.group_id for post in posts}
+        ))
+    for (form, result), post in zip(valid, posts):
+        result["id"] = post.pk
+    return results
+
+
+def create_comments(author, items):
+    items = [item if isinstance(item, dict) else {} for item in items]
+    targets = Post.objects.filter(pk__in={
+        item.get("post") for item in items
+        if isinstance(item.get("post"), int)
+    }).only("author_id", "group_id").in_bulk()
+    forms = []
+    for item in items:
+        form = CommentForm(item)
+        form.post = targets.get(item.get("post"))
+        if form.post is None:
+            form.add_error(None, "Пост не найден.")
+        forms.append(form)
+    results, valid = validate(forms)
+    comments = []
+    for form, result in valid:
+        comment = form.save(commit=False)
+        comment.author = author
+        comment.post = form.post
+        comments.append(comment)
+    with transaction.atomic():
+        comments = insert(Comment, comments, {"author": author})
+        for post_id, total in Counter(
+                comment.post_id for comment in comments).items():
+            bump_comment_count(post_id, total)
+    scopes = set()
+    for comment in comments:
+        scopes.update(post_scopes(comment.post.author_id,
+                                  comment.post.group_id))
+    if scopes:
+        bump_feed_version(*scopes)
+    for (form, result), comment in zip(valid, comments):
+        result["id"] = comment.pk
+    return results
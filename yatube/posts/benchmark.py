@@ -0,0 +1,545 @@
+import asyncio
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection, connections, reset_queries, transaction
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db.models import Count
+from django.template.backends.django import DjangoTemplates
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.utils.text import compress_string
+
+from posts import graph, search
+from posts.models import Comment, Follow, Group, Post, User
+from posts.paginator import CursorPaginator, encode_cursor
+from posts.seeding import zipf_weights
+from posts.settings import ASYNC_VIEWS, POSTS_PER_PAGE
+
+PERCENTILES = (50, 90, 95, 99)
+BENCH_REMOTE_ADDR = "192.0.2.1"
+RENDER_SIZES = (10, 50, 100)
+RENDER_TEMPLATE = "{% load post_list %}{% post_list page %}"
+GRAPH_CACHED_USERS = 100
+SEARCH_SIZES = (2000, 8000, 32000)
+
+
+def percentile(samples, share):
+    ordered = sorted(samples)
+    index = (len(ordered) - 1) * share / 100
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+        index - lower)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ("git", "rev-parse", "--short", "HEAD"), capture_output=True,
+            check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_cases():
+    cases = {}
+    if not Post.objects.exists():
+        return cases
+    cases["index"] = (reverse("index"), None)
+    middle = Post.objects.order_by("-pub_date", "-pk")[
+        Post.objects.count() // 2]
+    cases["index_deep"] = (
+        reverse("index") + "?cursor=" + encode_cursor(
+            "n", (middle.pub_date, middle.pk)),
+        None
+    )
+    group = Group.objects.annotate(
+        total=Count("posts")).order_by("-total").first()
+    if group is not None:
+        cases["group_posts"] = (reverse("group", args=[group.slug]), None)
+    author = User.objects.filter(stats__isnull=False).order_by(
+        "-stats__followers_count").first()
+    if author is not None:
+        cases["profile"] = (reverse("profile", args=[author.username]), None)
+    post = Post.objects.select_related("author").order_by(
+        "-comment_count", "-pk").first()
+    cases["post_view"] = (
+        reverse("post", args=[post.author.username, post.pk]), None
+    )
+    follower = User.objects.filter(stats__isnull=False).order_by(
+        "-stats__following_count").first()
+    if follower is not None:
+        cases["follow_index"] = (reverse("follow_index"), follower)
+    return cases
+
+
+def summarize(timings):
+    result = {
+        "mean_ms": round(statistics.mean(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+    for share in PERCENTILES:
+        result[f"p{share}_ms"] = round(percentile(timings, share), 3)
+    return result
+
+
+def measure(client, url, repeat, warmup, cold):
+    timings, queries, statuses = [], [], set()
+    for attempt in range(warmup + repeat):
+        if cold:
+            cache.clear()
+        reset_queries()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url)
+            elapsed = (time.perf_counter() - started) * 1000
+        if attempt < warmup:
+            continue
+        timings.append(elapsed)
+        queries.append(len(captured))
+        statuses.add(response.status_code)
+    return {
+        "url": url,
+        "status": sorted(statuses),
+        "repeat": repeat,
+        "queries_min": min(queries),
+        "queries_max": max(queries),
+        **summarize(timings),
+    }
+
+
+def run(repeat=50, warmup=5, cold=False, only=None):
+    results = {}
+    with override_settings(DEBUG=False):
+        for name, (url, user) in bench_cases().items():
+            if only and name not in only:
+                continue
+            client = Client()
+            if user is not None:
+                client.force_login(user)
+            results[name] = measure(client, url, repeat, warmup, cold)
+    return {**metadata(), "cold": cold, "results": results}
+
+
+def metadata():
+    return {
+        "commit": git_commit(),
+        "created": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "cache": settings.CACHES["default"]["BACKEND"],
+        "rows": {
+            model.__name__: model.objects.count()
+            for model in (User, Group, Post, Comment, Follow)
+        },
+    }
+
+
+def session_cookie(user):
+    if user is None:
+        return ""
+    client = Client()
+    client.force_login(user)
+    return "; ".join(f"{name}={morsel.value}"
+                     for name, morsel in client.cookies.items())
+
+
+def wsgi_request(handler, url, cookie):
+    path, _, query = url.partition("?")
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "REMOTE_ADDR": BENCH_REMOTE_ADDR,
+        "HTTP_COOKIE": cookie,
+    }
+    setup_testing_defaults(environ)
+    statuses = []
+    response = handler(environ, lambda status, headers, exc_info=None:
+                       statuses.append(int(status.split()[0])))
+    for chunk in response:
+        pass
+    response.close()
+    return statuses[0]
+
+
+async def asgi_request(handler, url, cookie):
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(b"cookie", cookie.encode())] if cookie else [],
+        "client": (BENCH_REMOTE_ADDR, 0),
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await handler(scope, receive, send)
+    return messages[0]["status"]
+
+
+def timed_wsgi(handler, url, cookie):
+    started = time.perf_counter()
+    status = wsgi_request(handler, url, cookie)
+    return (time.perf_counter() - started) * 1000, status
+
+
+async def timed_asgi(handler, url, cookie, semaphore):
+    async with semaphore:
+        started = time.perf_counter()
+        status = await asgi_request(handler, url, cookie)
+        return (time.perf_counter() - started) * 1000, status
+
+
+def drive_wsgi(url, cookie, requests, concurrency):
+    handler = WSGIHandler()
+    with ThreadPoolExecutor(concurrency) as executor:
+        return list(executor.map(
+            lambda number: timed_wsgi(handler, url, cookie), range(requests)
+        ))
+
+
+def drive_asgi(url, cookie, requests, concurrency):
+    handler = ASGIHandler()
+
+    async def drive():
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(
+            timed_asgi(handler, url, cookie, semaphore)
+            for number in range(requests)
+        ))
+
+    return asyncio.run(drive())
+
+
+def production_settings():
+    middleware = [name for name in settings.MIDDLEWARE
+                  if not name.startswith("debug_toolbar")]
+    return override_settings(DEBUG=False, MIDDLEWARE=middleware)
+
+
+def run_concurrent(server, requests=200, concurrency=10, only=None):
+    drive = drive_asgi if server == "asgi" else drive_wsgi
+    results = {}
+    with production_settings():
+        for name, (url, user) in bench_cases().items():
+            if only and name not in only:
+                continue
+            cookie = session_cookie(user)
+            drive(url, cookie, concurrency, concurrency)
+            started = time.perf_counter()
+            samples = drive(url, cookie, requests, concurrency)
+            elapsed = time.perf_counter() - started
+            results[name] = {
+                "url": url,
+                "status": sorted({status for timing, status in samples}),
+                "requests": requests,
+                "concurrency": concurrency,
+                "throughput_rps": round(requests / elapsed, 1),
+                **summarize([timing for timing, status in samples]),
+            }
+    return {**metadata(), "server": server,
+            "async_views": ASYNC_VIEWS, "results": results}
+
+
+def compare(current, baseline, metric="p95_ms"):
+    changes = {}
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get(metric):
+            continue
+        changes[name] = {
+            "baseline": previous[metric],
+            "current": result[metric],
+            "ratio": round(result[metric] / previous[metric], 3),
+            "queries": (result.get("queries_max", 0) -
+                        previous.get("queries_max", 0)),
+        }
+    return changes
+
+
+def connect_timings(repeat):
+    timings = []
+    for attempt in range(repeat):
+        connection.close()
+        started = time.perf_counter()
+        connection.ensure_connection()
+        timings.append((time.perf_counter() - started) * 1000)
+    return summarize(timings)
+
+
+def run_connections(requests=200, max_ages=(0, 60), only=None):
+    database = connections.databases["default"]
+    configured = database["CONN_MAX_AGE"]
+    results = {}
+    try:
+        with production_settings():
+            for name, (url, user) in bench_cases().items():
+                if only and name not in only:
+                    continue
+                cookie = session_cookie(user)
+                for max_age in max_ages:
+                    connection.close()
+                    database["CONN_MAX_AGE"] = max_age
+                    drive_wsgi(url, cookie, 5, 1)
+                    samples = drive_wsgi(url, cookie, requests, 1)
+                    results[f"{name}_max_age_{max_age}"] = {
+                        "url": url,
+                        "conn_max_age": max_age,
+                        "status": sorted({status for timing, status in
+                                          samples}),
+                        "requests": requests,
+                        **summarize([timing for timing, status in samples]),
+                    }
+    finally:
+        database["CONN_MAX_AGE"] = configured
+        connection.close()
+    return {**metadata(), "connect": connect_timings(requests),
+            "results": results}
+
+
+def template_backend(cached):
+    params = settings.TEMPLATES[0]
+    loaders = settings.TEMPLATE_LOADERS
+    if cached:
+        loaders = [("django.template.loaders.cached.Loader", loaders)]
+    return DjangoTemplates({
+        "NAME": "bench",
+        "DIRS": params["DIRS"],
+        "APP_DIRS": False,
+        "OPTIONS": {**params["OPTIONS"], "debug": False, "loaders": loaders},
+    })
+
+
+def run_templates(sizes=RENDER_SIZES, repeat=50, warmup=5):
+    request = RequestFactory().get(reverse("index"))
+    request.user = AnonymousUser()
+    posts = list(Post.objects.for_feed()[:max(sizes)])
+    results = {}
+    for loader in ("cached", "uncached"):
+        template = template_backend(loader == "cached").from_string(
+            RENDER_TEMPLATE)
+        for size in sizes:
+            page = posts[:size]
+            if not page:
+                continue
+            timings = []
+            for attempt in range(warmup + repeat):
+                started = time.perf_counter()
+                template.render({"page": page}, request)
+                if attempt >= warmup:
+                    timings.append((time.perf_counter() - started) * 1000)
+            result = summarize(timings)
+            results[f"{loader}_{size}"] = {
+                "loader": loader,
+                "posts": len(page),
+                "us_per_post": round(result["p50_ms"] * 1000 / len(page), 1),
+                **result,
+            }
+    return {**metadata(), "results": results}
+
+
+def api_url(url):
+    path, _, query = url.partition("?")
+    match = resolve(path)
+    url = reverse("api:" + match.url_name, kwargs=match.kwargs)
+    return url + "?" + query if query else url
+
+
+def payload(client, url):
+    content = client.get(url).content
+    return {"bytes": len(content), "gzip_bytes": len(compress_string(content))}
+
+
+def run_api(repeat=50, warmup=5, cold=False, only=None):
+    results = {}
+    with override_settings(DEBUG=False):
+        for name, (url, user) in bench_cases().items():
+            if only and name not in only:
+                continue
+            client = Client()
+            if user is not None:
+                client.force_login(user)
+            for kind, target in (("html", url), ("api", api_url(url))):
+                results[f"{name}_{kind}"] = {
+                    **measure(client, target, repeat, warmup, cold),
+                    **payload(client, target),
+                }
+    return {**metadata(), "cold": cold, "results": results}
+
+
+def power_law_edges(users, edges, alpha, rng):
+    weights = zipf_weights(users, alpha)
+    ids = list(range(1, users + 1))
+    followers = ids[:]
+    rng.shuffle(followers)
+    pairs = set()
+    while len(pairs) < edges:
+        count = edges - len(pairs)
+        pairs.update(
+            (user, author) for user, author in zip(
+                rng.choices(followers, cum_weights=weights, k=count),
+                rng.choices(ids, cum_weights=weights, k=count)
+            ) if user != author
+        )
+    return pairs
+
+
+def timed(function, arguments, repeat=1):
+    timings = []
+    for args in arguments:
+        started = time.perf_counter()
+        for attempt in range(repeat):
+            function(*args)
+        timings.append((time.perf_counter() - started) * 10 ** 6 / repeat)
+    result = {"mean_us": round(statistics.mean(timings), 2)}
+    for share in PERCENTILES:
+        result[f"p{share}_us"] = round(percentile(timings, share), 2)
+    return result
+
+
+def db_is_following(user_id, author_id):
+    return Follow.objects.filter(user_id=user_id,
+                                 author_id=author_id).exists()
+
+
+def run_follow_graph(users=50000, edges=1000000, lookups=10000, alpha=1.2,
+                     seed=1):
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    pairs = list(power_law_edges(users, edges, alpha, rng))
+    generated = time.perf_counter() - started
+
+    started = time.perf_counter()
+    adjacent = {graph.FOLLOWING: defaultdict(list),
+                graph.FOLLOWERS: defaultdict(list)}
+    for user, author in pairs:
+        adjacent[graph.FOLLOWING][user].append(author)
+        adjacent[graph.FOLLOWERS][author].append(user)
+    packed = {
+        direction: {user: graph.pack(ids) for user, ids in lists.items()}
+        for direction, lists in adjacent.items()
+    }
+    built = time.perf_counter() - started
+    following = {user: graph.unpack(data)
+                 for user, data in packed[graph.FOLLOWING].items()}
+    followers = {user: graph.unpack(data)
+                 for user, data in packed[graph.FOLLOWERS].items()}
+    sets = {user: set(ids) for user, ids in
+            adjacent[graph.FOLLOWING].items()}
+    empty = graph.unpack(b"")
+
+    sample = rng.sample(pairs, lookups // 2) + [
+        (rng.randint(1, users), rng.randint(1, users))
+        for number in range(lookups - lookups // 2)
+    ]
+    cached = rng.sample(sorted(following),
+                        min(GRAPH_CACHED_USERS, len(following)))
+    cache.set_many({f"bench-graph:{user}": packed[graph.FOLLOWING][user]
+                    for user in cached}, None)
+    results = {
+        "is_following_array": timed(lambda user, author: graph.contains(
+            following.get(user, empty), author), sample, 10),
+        "is_following_set": timed(lambda user, author: author in sets.get(
+            user, ()), sample, 10),
+        "is_following_cache": timed(lambda user, author: graph.contains(
+            graph.unpack(cache.get(f"bench-graph:{user}")), author
+        ), [(user, rng.randint(1, users)) for user in cached], 10),
+        "mutual_array": timed(lambda user: graph.intersect(
+            following.get(user, empty), followers.get(user, empty)
+        ), [(user, ) for user, author in sample[:1000]]),
+    }
+    cache.delete_many([f"bench-graph:{user}" for user in cached])
+    cached_users = Follow.objects.values("user_id").distinct()
+    stored = list(Follow.objects.filter(
+        user_id__in=cached_users[:GRAPH_CACHED_USERS]
+    ).values_list("user_id", "author_id")[:lookups // 10])
+    if stored:
+        results["is_following_db"] = timed(db_is_following, stored)
+        for user, author in stored:
+            graph.is_following(user, author)
+        results["is_following_graph"] = timed(graph.is_following, stored)
+    in_degrees = sorted(map(len, followers.values()))
+    return {
+        **metadata(),
+        "users": users,
+        "edges": len(pairs),
+        "alpha": alpha,
+        "followers_max": in_degrees[-1],
+        "followers_median": statistics.median(in_degrees),
+        "generate_s": round(generated, 2),
+        "build_s": round(built, 2),
+        "array_bytes": sum(len(data) for entries in packed.values()
+                           for data in entries.values()),
+        "following_array_bytes": sum(
+            len(data) for data in packed[graph.FOLLOWING].values()),
+        "following_set_bytes": sum(
+            sys.getsizeof(ids) for ids in sets.values()),
+        "results": results,
+    }
+
+
+def search_timings(query, repeat):
+    paginator = CursorPaginator(search.search_posts(query), POSTS_PER_PAGE,
+                                key="rank")
+    first, following = [], []
+    for attempt in range(repeat):
+        started = time.perf_counter()
+        page = paginator.get_page()
+        first.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        paginator.get_page(page.next_cursor)
+        following.append((time.perf_counter() - started) * 1000)
+    return page, summarize(first), summarize(following)
+
+
+def run_search(sizes=SEARCH_SIZES, repeat=5):
+    results = {}
+    for size in sizes:
+        query = f"bench{size}match"
+        with transaction.atomic():
+            author = User.objects.create(username=f"bench-search-{size}")
+            Post.objects.bulk_create(
+                Post(text=f"{query} {'слово ' * (number % 7)}",
+                     author=author)
+                for number in range(size)
+            )
+            search.index_posts(Post.objects.filter(author=author))
+            page, first, following = search_timings(query, repeat)
+            transaction.set_rollback(True)
+        results[f"matches_{size}"] = {
+            "matches": size,
+            "page": len(page),
+            "first_page": first,
+            "next_page": following,
+        }
+    return {**metadata(), "results": results}
@@ -0,0 +1,202 @@
+import hashlib
+import math
+import random
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import parse_http_date_safe
+
+from posts.metrics import record_cache
+from posts.paginator import CursorPage
+from posts.routers import primary_reads, replica_aliases
+from posts.settings import (FEED_CACHE_TIMEOUT, PAGE_CACHE_TIMEOUT,
+                            PAGE_EDGE_MAX_AGE, REPLICA_STICKY_SECONDS,
+                            STAMPEDE_BETA, STAMPEDE_LOCK_TIMEOUT,
+                            STAMPEDE_LOCK_WAIT, STAMPEDE_WAIT_STEP)
+
+ALL_FEEDS = "all"
+
+
+def is_fresh(entry, beta=STAMPEDE_BETA):
+    value, delta, expiry = entry
+    jitter = delta * beta * math.log(1.0 - random.random())
+    return time.time() - jitter < expiry
+
+
+def wait_for(key):
+    deadline = time.monotonic() + STAMPEDE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(STAMPEDE_WAIT_STEP)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def get_or_recompute(key, compute, timeout, family):
+    entry = cache.get(key)
+    if entry is not None and is_fresh(entry):
+        record_cache(family, "hit")
+        return entry[0]
+    record_cache(family, "miss" if entry is None else "early")
+    lock_key = f"{key}:lock"
+    locked = cache.add(lock_key, 1, STAMPEDE_LOCK_TIMEOUT)
+    if not locked:
+        if entry is None:
+            entry = wait_for(key)
+        if entry is not None:
+            record_cache(family, "wait")
+            return entry[0]
+    try:
+        started = time.monotonic()
+        value = compute()
+        delta = time.monotonic() - started
+        expiry = math.inf if timeout is None else time.time() + timeout
+        cache.set(key, (value, delta, expiry), timeout)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value
+
+
+def index_scope():
+    return "index"
+
+
+def group_scope(group_id):
+    return f"group:{group_id}"
+
+
+def profile_scope(author_id):
+    return f"profile:{author_id}"
+
+
+def user_scope(user_id):
+    return f"user:{user_id}"
+
+
+def feed_version(scope):
+    key = f"feed-version:{scope}"
+    version = cache.get(key)
+    if version is None:
+        seed = time.time_ns()
+        cache.add(key, seed, None)
+        version = cache.get(key, seed)
+    return version
+
+
+def feed_versions(*scopes):
+    keys = [f"feed-version:{scope}" for scope in scopes]
+    found = cache.get_many(keys)
+    return tuple(found[key] if key in found else feed_version(scope)
+                 for key, scope in zip(keys, scopes))
+
+
+def bump_feed_version(*scopes):
+    for scope in scopes:
+        key = f"feed-version:{scope}"
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+    cache.set_many({f"feed-bumped:{scope}": True for scope in scopes},
+                   REPLICA_STICKY_SECONDS)
+    now = time.time()
+    cache.set_many({f"feed-modified:{scope}": now for scope in scopes}, None)
+
+
+def bump_on_commit(*scopes):
+    transaction.on_commit(lambda: bump_feed_version(*scopes))
+
+
+def feed_modified(*scopes):
+    keys = [f"feed-modified:{scope}" for scope in scopes]
+    stamps = cache.get_many(keys)
+    missing = [key for key in keys if key not in stamps]
+    now = time.time()
+    for key in missing:
+        cache.add(key, now, None)
+    if missing:
+        stamps.update(cache.get_many(missing))
+    return max(stamps.values(), default=now)
+
+
+def recently_bumped(scope):
+    return bool(cache.get_many(
+        [f"feed-bumped:{ALL_FEEDS}", f"feed-bumped:{scope}"]
+    ))
+
+
+def post_scopes(author_id, *group_ids):
+    scopes = {index_scope(), profile_scope(author_id)}
+    scopes.update(group_scope(pk) for pk in group_ids if pk is not None)
+    return scopes
+
+
+def feed_key(scope, cursor):
+    versions = f"{feed_version(ALL_FEEDS)}.{feed_version(scope)}"
+    cursor = hashlib.md5((cursor or "").encode()).hexdigest()
+    return f"{scope}:{versions}:{cursor}"
+
+
+def get_cached_page(paginator, cursor, scope, variant=""):
+    def compute():
+        with primary_reads(recently_bumped(scope)):
+            page = paginator.get_page(cursor)
+        return page.object_list, page.has_next(), page.has_previous()
+
+    object_list, has_next, has_previous = get_or_recompute(
+        "feed-posts:" + variant + feed_key(scope, cursor), compute,
+        FEED_CACHE_TIMEOUT, "feed_posts"
+    )
+    return CursorPage(object_list, paginator, has_next, has_previous)
+
+
+def viewer_part(user, page):
+    if user.is_authenticated and any(
+            post.author_id == user.pk for post in page):
+        return f"user:{user.pk}"
+    return "shared"
+
+
+def feed_fragment(request, page, scope):
+    return {
+        "timeout": FEED_CACHE_TIMEOUT,
+        "key": feed_key(scope, request.GET.get("cursor")),
+        "viewer": viewer_part(request.user, page),
+    }
+
+
+def page_key(request):
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"page:{url}"
+
+
+def get_cached_response(request):
+    entry = cache.get(page_key(request))
+    if entry is None or feed_versions(*entry[1]) != entry[2]:
+        record_cache("page", "miss")
+        return None
+    record_cache("page", "hit")
+    response = entry[0]
+    return get_conditional_response(
+        request, etag=response.get("ETag"),
+        last_modified=parse_http_date_safe(response.get("Last-Modified", "")),
+        response=response
+    ) or response
+
+
+def cache_response(request, response, scopes, versions):
+    if (request.method != "GET" or response.status_code != 200 or
+            response.streaming or response.cookies):
+        return response
+    patch_cache_control(response, public=True)
+    response["Surrogate-Control"] = f"max-age={PAGE_EDGE_MAX_AGE}"
+    response["Surrogate-Key"] = " ".join(scopes)
+    if replica_aliases() and any(recently_bumped(scope) for scope in scopes):
+        return response
+    cache.set(page_key(request), (response, scopes, versions),
+              PAGE_CACHE_TIMEOUT)
+    return response
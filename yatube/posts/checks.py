@@ -0,0 +1,16 @@
+from django.core.checks import Tags, Warning, register
+
+from posts.settings import SHARED_CACHE
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if SHARED_CACHE:
+        return []
+    return [Warning(
+        "The default cache is local to each process, so feed versions, "
+        "cached pages and ETags differ between workers.",
+        hint="Set YATUBE_CACHE_BACKEND to memcached, redis or file when "
+             "running more than one worker.",
+        id="posts.W001",
+    )]
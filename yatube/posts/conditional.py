@@ -0,0 +1,85 @@
+import asyncio
+import hashlib
+from functools import wraps
+
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                patch_vary_headers)
+from django.utils.http import http_date, quote_etag
+
+from posts.cache import ALL_FEEDS, feed_modified, feed_versions
+
+
+class NotModified(Exception):
+    def __init__(self, response):
+        super().__init__(response.status_code)
+        self.response = response
+
+
+class PageValidators:
+    def __init__(self, etag, last_modified, private, scopes, versions):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.private = private
+        self.scopes = scopes
+        self.versions = versions
+
+    def apply(self, response):
+        if response.status_code in (200, 304):
+            response.setdefault("ETag", self.etag)
+            if self.last_modified is not None:
+                response.setdefault("Last-Modified",
+                                    http_date(self.last_modified))
+        patch_vary_headers(response, ("Cookie", ))
+        patch_cache_control(response, no_cache=True, private=self.private)
+        return response
+
+
+def check_modified(request, *scopes):
+    if request.method not in ("GET", "HEAD"):
+        return
+    scopes = (ALL_FEEDS, *scopes)
+    versions = feed_versions(*scopes)
+    modified = int(feed_modified(*scopes))
+    private = request.user.is_authenticated
+    viewer = f"user:{request.user.pk}" if private else "anonymous"
+    etag = hashlib.md5(
+        f"{versions}:{modified}:{viewer}:{request.get_full_path()}".encode()
+    ).hexdigest()
+    request.page_validators = PageValidators(
+        quote_etag(etag), None if private else modified, private, scopes,
+        versions
+    )
+    response = get_conditional_response(
+        request, etag=request.page_validators.etag,
+        last_modified=request.page_validators.last_modified
+    )
+    if response is not None:
+        raise NotModified(response)
+
+
+def finish(request, response):
+    validators = getattr(request, "page_validators", None)
+    if validators is None:
+        return response
+    return validators.apply(response)
+
+
+def conditional_page(view):
+    if asyncio.iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            try:
+                response = await view(request, *args, **kwargs)
+            except NotModified as error:
+                response = error.response
+            return finish(request, response)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            response = view(request, *args, **kwargs)
+        except NotModified as error:
+            response = error.response
+        return finish(request, response)
+    return wrapper
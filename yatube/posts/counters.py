@@ -0,0 +1,46 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from posts.models import Comment, Follow, Post, User, UserStats
+
+
+def bump_user_stats(user_id, field, delta):
+    stats = UserStats.objects.filter(user_id=user_id)
+    if delta < 0:
+        stats = stats.filter(**{f"{field}__gte": -delta})
+    updated = stats.update(
+        **{field: F(field) + delta}
+    )
+    if not updated and delta > 0:
+        UserStats.objects.get_or_create(user_id=user_id)
+        bump_user_stats(user_id, field, delta)
+
+
+def bump_comment_count(post_id, delta):
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        posts = posts.filter(comment_count__gte=-delta)
+    posts.update(
+        comment_count=F("comment_count") + delta
+    )
+
+
+def count_subquery(model, field, outer="pk"):
+    counts = model.objects.filter(**{field: OuterRef(outer)}).order_by()
+    counts = counts.values(field).annotate(total=Count("pk")).values("total")
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def recount():
+    missing = User.objects.exclude(
+        pk__in=UserStats.objects.values("user_id")
+    ).values_list("pk", flat=True)
+    UserStats.objects.bulk_create(
+        (UserStats(user_id=pk) for pk in missing), ignore_conflicts=True
+    )
+    Post.objects.update(comment_count=count_subquery(Comment, "post"))
+    UserStats.objects.update(
+        followers_count=count_subquery(Follow, "author", "user_id"),
+        following_count=count_subquery(Follow, "user", "user_id"),
+        posts_count=count_subquery(Post, "author", "user_id"),
+    )
@@ -1,12 +1,14 @@
 from django.forms import ModelForm
 
 from .models import Comment, Post
+from .uploads import LimitedImageField
 
 
 class PostForm(ModelForm):
     class Meta:
         model = Post
         fields = ("text", "group", "image")
+        field_classes = {"image": LimitedImageField}
 
 
 class CommentForm(ModelForm):
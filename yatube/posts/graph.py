@@ -0,0 +1,69 @@
+from array import array
+from bisect import bisect_left
+
+from posts.cache import (ALL_FEEDS, feed_versions, get_or_recompute,
+                         recently_bumped, user_scope)
+from posts.models import Follow
+from posts.routers import primary_reads
+from posts.settings import FOLLOW_GRAPH_TIMEOUT
+
+FOLLOWING = "following"
+FOLLOWERS = "followers"
+DIRECTIONS = {
+    FOLLOWING: ("user_id", "author_id"),
+    FOLLOWERS: ("author_id", "user_id"),
+}
+
+
+def pack(ids):
+    return array("i", sorted(ids)).tobytes()
+
+
+def unpack(data):
+    ids = array("i")
+    ids.frombytes(data)
+    return ids
+
+
+def contains(ids, value):
+    index = bisect_left(ids, value)
+    return index < len(ids) and ids[index] == value
+
+
+def intersect(first, second):
+    if len(first) > len(second):
+        first, second = second, first
+    return array("i", (value for value in first if contains(second, value)))
+
+
+def adjacency(user_id, direction):
+    field, other = DIRECTIONS[direction]
+    scope = user_scope(user_id)
+
+    def compute():
+        with primary_reads(recently_bumped(scope)):
+            return pack(Follow.objects.filter(
+                **{field: user_id}
+            ).values_list(other, flat=True))
+
+    versions = ".".join(map(str, feed_versions(ALL_FEEDS, scope)))
+    return unpack(get_or_recompute(
+        f"follow-graph:{direction}:{user_id}:{versions}", compute,
+        FOLLOW_GRAPH_TIMEOUT, "follow_graph"
+    ))
+
+
+def following(user_id):
+    return adjacency(user_id, FOLLOWING)
+
+
+def followers(user_id):
+    return adjacency(user_id, FOLLOWERS)
+
+
+def is_following(user_id, author_id):
+    return contains(following(user_id), author_id)
+
+
+def mutual(user_id):
+    return intersect(following(user_id), followers(user_id))
@@ -0,0 +1,116 @@
+import hashlib
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from posts.models import Post
+from posts.settings import (IMAGE_VARIANT_ASPECT, IMAGE_VARIANT_FORMATS,
+                            IMAGE_VARIANT_QUALITY, IMAGE_VARIANT_WIDTHS,
+                            IMAGE_VARIANTS_DIR, MAX_IMAGE_PIXELS)
+
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp",
+              "jpeg": "image/jpeg"}
+EXTENSIONS = {"avif": "avif", "webp": "webp", "jpeg": "jpg"}
+FALLBACK_FORMAT = "jpeg"
+
+
+def supported_formats():
+    Image.init()
+    return [name for name in IMAGE_VARIANT_FORMATS
+            if name == FALLBACK_FORMAT or name.upper() in Image.SAVE]
+
+
+def variant_widths(source_width):
+    widths = [width for width in IMAGE_VARIANT_WIDTHS
+              if width <= source_width]
+    return widths or [min(IMAGE_VARIANT_WIDTHS)]
+
+
+def variant_size(width):
+    aspect_width, aspect_height = IMAGE_VARIANT_ASPECT
+    return width, round(width * aspect_height / aspect_width)
+
+
+def flatten(image):
+    image = ImageOps.exif_transpose(image).convert("RGBA")
+    background = Image.new("RGB", image.size, "white")
+    background.paste(image, mask=image.getchannel("A"))
+    return background
+
+
+def encode(image, image_format):
+    buffer = BytesIO()
+    options = {"quality": IMAGE_VARIANT_QUALITY}
+    if image_format == "jpeg":
+        options.update(optimize=True, progressive=True)
+    image.save(buffer, image_format.upper(), **options)
+    return buffer.getvalue()
+
+
+def save_variant(content, image_format, width):
+    digest = hashlib.sha256(content).hexdigest()[:20]
+    extension = EXTENSIONS[image_format]
+    name = f"{IMAGE_VARIANTS_DIR}/{digest}-{width}.{extension}"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+    return name
+
+
+def variant_files(variants):
+    return {name for source in (variants or {}).get("sources", ())
+            for name, width in source["files"]}
+
+
+def variants_key(variants):
+    return (variants or {}).get("fallback", "")
+
+
+def delete_variants(variants, keep=None):
+    key = variants_key(variants)
+    if (not key or key == variants_key(keep) or
+            Post.objects.filter(image_variants_key=key).exists()):
+        return
+    for name in variant_files(variants) - variant_files(keep):
+        default_storage.delete(name)
+
+
+def build_variants(image_file):
+    with Image.open(image_file) as original:
+        width, height = original.size
+        if width * height > MAX_IMAGE_PIXELS:
+            raise Image.DecompressionBombError(
+                f"Image has {width * height} pixels."
+            )
+        source = flatten(original)
+    widths = variant_widths(source.width)
+    resized = {
+        width: ImageOps.fit(source, variant_size(width), Image.LANCZOS)
+        for width in widths
+    }
+    sources = []
+    for image_format in supported_formats():
+        sources.append({
+            "type": MIME_TYPES[image_format],
+            "files": [
+                [save_variant(encode(resized[width], image_format),
+                              image_format, width), width]
+                for width in widths
+            ],
+        })
+    fallback_width = max(
+        [width for width in widths if width <= IMAGE_VARIANT_ASPECT[0]]
+        or widths
+    )
+    fallback_files = next(source["files"] for source in sources
+                          if source["type"] == MIME_TYPES[FALLBACK_FORMAT])
+    fallback = next(name for name, width in fallback_files
+                    if width == fallback_width)
+    width, height = variant_size(fallback_width)
+    return {
+        "sources": sources,
+        "fallback": fallback,
+        "width": width,
+        "height": height,
+    }
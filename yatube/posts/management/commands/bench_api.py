@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.benchmark import run_api
+
+
+class Command(BaseCommand):
+    help = ("Compare latency and payload size of the JSON API with the "
+            "HTML pages.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--cold", action="store_true",
+                            help="Clear the cache before every request.")
+        parser.add_argument("--only", nargs="+", metavar="CASE")
+        parser.add_argument("--output", help="Write results to this file.")
+
+    def handle(self, *args, **options):
+        results = run_api(options["repeat"], options["warmup"],
+                          options["cold"], options["only"])
+        if not results["results"]:
+            raise CommandError("No posts, run seed_data first.")
+        for name, result in results["results"].items():
+            self.stdout.write(
+                f"{name}: p50 {result['p50_ms']:.2f} ms, "
+                f"p95 {result['p95_ms']:.2f} ms, "
+                f"{result['bytes']} bytes, {result['gzip_bytes']} gzipped"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
@@ -0,0 +1,47 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.benchmark import compare, run_concurrent
+
+
+class Command(BaseCommand):
+    help = ("Load the feed views concurrently through the WSGI or ASGI "
+            "handler and write throughput and latency as JSON. Set "
+            "YATUBE_ASYNC_VIEWS=1 to serve the async views.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--server", choices=("wsgi", "asgi"),
+                            default="wsgi")
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=10)
+        parser.add_argument("--only", nargs="+", metavar="CASE")
+        parser.add_argument("--output", help="Write results to this file.")
+        parser.add_argument("--compare", metavar="BASELINE",
+                            help="Compare p95 with a previous results file.")
+
+    def handle(self, *args, **options):
+        results = run_concurrent(options["server"], options["requests"],
+                                 options["concurrency"], options["only"])
+        if not results["results"]:
+            raise CommandError("No posts, run seed_data first.")
+        views = "async" if results["async_views"] else "sync"
+        self.stdout.write(f"{options['server']} with {views} views")
+        for name, result in results["results"].items():
+            self.stdout.write(
+                f"{name}: {result['throughput_rps']:.1f} req/s, "
+                f"p50 {result['p50_ms']:.2f} ms, "
+                f"p95 {result['p95_ms']:.2f} ms, "
+                f"status {result['status']}"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+        if options["compare"]:
+            with open(options["compare"]) as baseline:
+                changes = compare(results, json.load(baseline))
+            for name, change in changes.items():
+                self.stdout.write(
+                    f"{name}: p95 {change['baseline']:.2f} -> "
+                    f"{change['current']:.2f} ms (x{change['ratio']})"
+                )
@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.benchmark import run_connections
+
+
+class Command(BaseCommand):
+    help = ("Measure database connection setup cost and per-request "
+            "latency with and without persistent connections.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--max-age", type=int, nargs="+",
+                            default=[0, 60], dest="max_ages",
+                            help="CONN_MAX_AGE values to compare.")
+        parser.add_argument("--only", nargs="+", metavar="CASE")
+        parser.add_argument("--output", help="Write results to this file.")
+
+    def handle(self, *args, **options):
+        results = run_connections(options["requests"], options["max_ages"],
+                                  options["only"])
+        if not results["results"]:
+            raise CommandError("No posts, run seed_data first.")
+        connect = results["connect"]
+        self.stdout.write(f"connect: p50 {connect['p50_ms']:.3f} ms, "
+                          f"p95 {connect['p95_ms']:.3f} ms")
+        for name, result in results["results"].items():
+            self.stdout.write(f"{name}: p50 {result['p50_ms']:.2f} ms, "
+                              f"p95 {result['p95_ms']:.2f} ms")
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from posts.benchmark import run_follow_graph
+
+
+class Command(BaseCommand):
+    help = ("Measure follow graph lookups on a generated power-law graph "
+            "and against Follow queries.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50000)
+        parser.add_argument("--edges", type=int, default=1000000)
+        parser.add_argument("--lookups", type=int, default=10000)
+        parser.add_argument("--alpha", type=float, default=1.2)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--output", help="Write results to this file.")
+
+    def handle(self, *args, **options):
+        results = run_follow_graph(options["users"], options["edges"],
+                                   options["lookups"], options["alpha"],
+                                   options["seed"])
+        self.stdout.write(
+            f"{results['edges']} edges, {results['array_bytes']} array "
+            f"bytes, following arrays {results['following_array_bytes']} "
+            f"bytes against {results['following_set_bytes']} bytes of "
+            f"sets, built in {results['build_s']} s"
+        )
+        for name, result in results["results"].items():
+            self.stdout.write(
+                f"{name}: p50 {result['p50_us']:.2f} us, "
+                f"p99 {result['p99_us']:.2f} us"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
@@ -0,0 +1,29 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from posts.benchmark import SEARCH_SIZES, run_search
+
+
+class Command(BaseCommand):
+    help = ("Measure how search latency grows with the number of matching "
+            "posts. Test posts are rolled back afterwards.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+",
+                            default=list(SEARCH_SIZES),
+                            help="Matching posts per run.")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--output", help="Write results to this file.")
+
+    def handle(self, *args, **options):
+        results = run_search(options["sizes"], options["repeat"])
+        for name, result in results["results"].items():
+            self.stdout.write(
+                f"{name}: first page p50 "
+                f"{result['first_page']['p50_ms']:.2f} ms, next page p50 "
+                f"{result['next_page']['p50_ms']:.2f} ms"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.benchmark import RENDER_SIZES, run_templates
+
+
+class Command(BaseCommand):
+    help = ("Measure post list render time per post with the cached and "
+            "the uncached template loader.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+",
+                            default=list(RENDER_SIZES),
+                            help="Posts per rendered page.")
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--output", help="Write results to this file.")
+
+    def handle(self, *args, **options):
+        results = run_templates(options["sizes"], options["repeat"],
+                                options["warmup"])
+        if not results["results"]:
+            raise CommandError("No posts, run seed_data first.")
+        for name, result in results["results"].items():
+            self.stdout.write(
+                f"{name}: {result['us_per_post']:.1f} us per post, "
+                f"p50 {result['p50_ms']:.2f} ms, "
+                f"p95 {result['p95_ms']:.2f} ms"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
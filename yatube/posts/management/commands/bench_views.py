@@ -0,0 +1,59 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.benchmark import compare, run
+
+
+class Command(BaseCommand):
+    help = ("Measure latency percentiles and query counts of the feed "
+            "views and write them as JSON.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--cold", action="store_true",
+                            help="Clear the cache before every request.")
+        parser.add_argument("--only", nargs="+", metavar="CASE")
+        parser.add_argument("--output", help="Write results to this file.")
+        parser.add_argument("--compare", metavar="BASELINE",
+                            help="Compare p95 with a previous results file.")
+        parser.add_argument("--threshold", type=float, default=1.2,
+                            help="Fail when p95 grows by more than this "
+                                 "ratio or queries grow.")
+
+    def handle(self, *args, **options):
+        results = run(options["repeat"], options["warmup"], options["cold"],
+                      options["only"])
+        if not results["results"]:
+            raise CommandError("No posts, run seed_data first.")
+        for name, result in results["results"].items():
+            self.stdout.write(
+                f"{name}: p50 {result['p50_ms']:.2f} ms, "
+                f"p95 {result['p95_ms']:.2f} ms, "
+                f"p99 {result['p99_ms']:.2f} ms, "
+                f"queries {result['queries_max']}"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+        if not options["compare"]:
+            return
+        with open(options["compare"]) as baseline:
+            baseline = json.load(baseline)
+        if baseline.get("cold") != results["cold"]:
+            raise CommandError("Baseline was measured with a different "
+                               "--cold setting.")
+        changes = compare(results, baseline)
+        regressions = []
+        for name, change in changes.items():
+            self.stdout.write(
+                f"{name}: p95 {change['baseline']:.2f} -> "
+                f"{change['current']:.2f} ms (x{change['ratio']}), "
+                f"queries {change['queries']:+d}"
+            )
+            if (change["ratio"] > options["threshold"] or
+                    change["queries"] > 0):
+                regressions.append(name)
+        if regressions:
+            raise CommandError(f"Regressions: {', '.join(regressions)}.")
@@ -0,0 +1,119 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from posts.models import Comment, Follow, Post, TimelineEntry
+from posts.paginator import keyset
+from posts.seeding import seed
+from posts.settings import POSTS_PER_PAGE
+from posts.timeline import follow_feed
+
+FEED_INDEXES = {
+    Post: ("post_feed", "post_author_feed", "post_group_feed"),
+    Comment: ("comment_post",),
+    Follow: ("follow_author",),
+    TimelineEntry: ("timeline_feed",),
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Print query plans and timings of the feed queries with and "
+            "without the feed indexes.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed-posts", type=int, default=0,
+                            help="Seed this many posts first, see seed_data.")
+        parser.add_argument("--seed-users", type=int, default=1000)
+        parser.add_argument("--seed-groups", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if options["seed_posts"]:
+            with transaction.atomic():
+                seed(users=options["seed_users"],
+                     groups=options["seed_groups"],
+                     posts=options["seed_posts"],
+                     comments=options["seed_posts"], image_share=0)
+        post = Post.objects.order_by("-pk").first()
+        if post is None:
+            self.stderr.write("No posts, use --seed-posts.")
+            return
+        self.stdout.write(f"Posts: {Post.objects.count()}")
+        queries = self.feed_queries(post)
+        self.report("With feed indexes", queries, options["repeat"])
+        try:
+            with transaction.atomic():
+                self.drop_feed_indexes()
+                self.report("Without feed indexes", queries,
+                            options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def feed_queries(self, post):
+        middle = Post.objects.order_by("pk")[
+            Post.objects.count() // 2:].first()
+        deep = Q(pub_date__lte=middle.pub_date) & (
+            Q(pub_date__lt=middle.pub_date) |
+            Q(pub_date=middle.pub_date, pk__lt=middle.pk)
+        )
+        ordered = ("-pub_date", "-pk")
+        follower = Follow.objects.filter(author=post.author).first()
+        user = follower.user if follower else post.author
+        feed = Post.objects.for_feed()
+        page = slice(0, POSTS_PER_PAGE + 1)
+        return {
+            "index": feed.order_by(*ordered)[page],
+            "index_deep": feed.filter(deep).order_by(*ordered)[page],
+            "group": feed.filter(group_id=post.group_id).order_by(
+                *ordered)[page],
+            "group_deep": feed.filter(deep, group_id=post.group_id).order_by(
+                *ordered)[page],
+            "profile": feed.filter(author_id=post.author_id).order_by(
+                *ordered)[page],
+            "profile_deep": feed.filter(
+                deep, author_id=post.author_id).order_by(*ordered)[page],
+            "follow": follow_feed(user).order_by(*ordered)[page],
+            "timeline": keyset(TimelineEntry.objects.filter(user=user),
+                               "pub_date", True, pk="post_id")[page],
+            "comments": Comment.objects.filter(post=post).order_by(
+                "-created")[:POSTS_PER_PAGE],
+            "followers": Follow.objects.filter(
+                author_id=post.author_id).values("user_id")[:POSTS_PER_PAGE],
+        }
+
+    def drop_feed_indexes(self):
+        with connection.cursor() as cursor:
+            for names in FEED_INDEXES.values():
+                for name in names:
+                    cursor.execute(
+                        f"DROP INDEX {connection.ops.quote_name(name)}")
+
+    def report(self, title, queries, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        for name, queryset in queries.items():
+            started = time.perf_counter()
+            for attempt in range(repeat):
+                list(queryset.all())
+            elapsed = (time.perf_counter() - started) / repeat * 1000
+            self.stdout.write(f"{name}: {elapsed:.2f} ms")
+            for line in self.explain(queryset, title):
+                self.stdout.write(f"    {line}")
+
+    def explain(self, queryset, title):
+        # The comment keeps sqlite3 from reusing a statement prepared
+        # before the indexes were dropped.
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"{connection.ops.explain_query_prefix()} {sql} "
+                f"/* {title} */", params
+            )
+            return [" ".join(str(value) for value in row)
+                    for row in cursor.fetchall()]
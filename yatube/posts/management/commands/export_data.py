@@ -0,0 +1,21 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from posts.transfer import export_dump, open_dump
+
+
+class Command(BaseCommand):
+    help = ("Stream users, groups, posts, comments and follows to a JSONL "
+            "file, gzipped when the name ends with .gz.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Output file, - for stdout.")
+
+    def handle(self, *args, **options):
+        if options["path"] == "-":
+            export_dump(sys.stdout)
+            return
+        with open_dump(options["path"], "w") as output:
+            count = export_dump(output)
+        self.stdout.write(self.style.SUCCESS(f"Exported records: {count}."))
@@ -0,0 +1,33 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.settings import TRANSFER_BATCH_SIZE
+from posts.transfer import import_dump, open_dump
+
+
+class Command(BaseCommand):
+    help = ("Load a JSONL dump written by export_data in batches, resuming "
+            "from the last committed batch after an interruption.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int,
+                            default=TRANSFER_BATCH_SIZE)
+        parser.add_argument("--checkpoint",
+                            help="Progress file, PATH.checkpoint by default.")
+        parser.add_argument("--restart", action="store_true",
+                            help="Ignore a saved checkpoint.")
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options["path"]):
+            raise CommandError(f"No such file: {options['path']}.")
+        checkpoint = options["checkpoint"] or f"{options['path']}.checkpoint"
+        if options["restart"] and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        with open_dump(options["path"], "r") as dump:
+            skipped, created = import_dump(dump, checkpoint,
+                                           options["batch_size"])
+        if skipped:
+            self.stdout.write(f"Resumed after line {skipped}.")
+        self.stdout.write(self.style.SUCCESS(f"Imported records: {created}."))
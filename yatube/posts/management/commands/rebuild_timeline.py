@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.timeline import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized follow feed from the follow graph."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild()
+        self.stdout.write(self.style.SUCCESS("Timeline rebuilt."))
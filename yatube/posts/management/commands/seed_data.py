@@ -0,0 +1,40 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.seeding import seed
+
+
+class Command(BaseCommand):
+    help = ("Seed users, groups, a power-law follow graph, posts with "
+            "images and comments for load testing.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--groups", type=int, default=50)
+        parser.add_argument("--posts", type=int, default=10000)
+        parser.add_argument("--comments", type=int, default=20000)
+        parser.add_argument("--follows-per-user", type=int, default=20)
+        parser.add_argument("--image-share", type=float, default=0.1,
+                            help="Share of posts with an image.")
+        parser.add_argument("--days", type=int, default=365,
+                            help="Spread post dates over this many days.")
+        parser.add_argument("--alpha", type=float, default=1.2,
+                            help="Power-law exponent of author popularity.")
+        parser.add_argument("--random-seed", type=int)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            prefix = seed(
+                users=options["users"],
+                groups=options["groups"],
+                posts=options["posts"],
+                comments=options["comments"],
+                follows_per_user=options["follows_per_user"],
+                image_share=options["image_share"],
+                days=options["days"],
+                alpha=options["alpha"],
+                rng=random.Random(options["random_seed"]),
+            )
+        self.stdout.write(self.style.SUCCESS(f"Seeded data: {prefix}."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.thumbnails import generate, run_job
+
+
+class Command(BaseCommand):
+    help = "Generate responsive image variants for posts with images."
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image="").exclude(image__isnull=True)
+        count = 0
+        for post_id in posts.values_list("pk", flat=True).iterator():
+            run_job(generate, post_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Thumbnails warmed: {count}."))
@@ -0,0 +1,160 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+from posts.settings import METRICS_BUCKETS, QUERY_BUDGET, QUERY_BUDGETS
+
+COUNTERS = (
+    "requests_total",
+    "db_queries_total",
+    "db_seconds_total",
+    "template_seconds_total",
+    "query_budget_exceeded_total",
+    "cache_events_total",
+    "cache_lookups_total",
+)
+HISTOGRAM = "request_duration_seconds"
+
+_current = ContextVar("request_metrics", default=None)
+_lock = threading.Lock()
+_values = defaultdict(Counter)
+_buckets = {}
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.cache = Counter()
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self.lock:
+                self.db_time += elapsed
+                self.queries += 1
+
+    def finish(self):
+        self.duration = time.perf_counter() - self.started
+
+    def server_timing(self, budget):
+        entries = [
+            f"total;dur={self.duration * 1000:.1f}",
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f"tpl;dur={self.template_time * 1000:.1f}",
+        ]
+        if self.cache:
+            hits = self.cache["hit"]
+            misses = sum(self.cache.values()) - hits
+            entries.append(f'cache;desc="{hits} hits {misses} misses"')
+        if self.queries > budget:
+            entries.append(
+                f'budget;desc="{self.queries} of {budget} queries"')
+        return ", ".join(entries)
+
+
+def start():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+@contextmanager
+def instrument():
+    request_metrics = _current.get()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            if (request_metrics is not None and
+                    request_metrics not in connection.execute_wrappers):
+                stack.enter_context(
+                    connection.execute_wrapper(request_metrics))
+        yield
+
+
+def record_template(duration):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.template_time += duration
+
+
+def record_cache(family, event):
+    with _lock:
+        _values["cache_lookups_total"][
+            (("family", family), ("event", event))] += 1
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.cache[event] += 1
+
+
+def query_budget(view):
+    return QUERY_BUDGETS.get(view, QUERY_BUDGET)
+
+
+def observe(view, status, metrics):
+    labels = (("view", view),)
+    with _lock:
+        _values["requests_total"][labels + (("status", str(status)),)] += 1
+        _values["db_queries_total"][labels] += metrics.queries
+        _values["db_seconds_total"][labels] += metrics.db_time
+        _values["template_seconds_total"][labels] += metrics.template_time
+        if metrics.queries > query_budget(view):
+            _values["query_budget_exceeded_total"][labels] += 1
+        for event, count in metrics.cache.items():
+            _values["cache_events_total"][
+                labels + (("event", event),)] += count
+        counts = _buckets.setdefault(labels, [0] * (len(METRICS_BUCKETS) + 1))
+        counts[bisect_left(METRICS_BUCKETS, metrics.duration)] += 1
+        _values[HISTOGRAM + "_sum"][labels] += metrics.duration
+
+
+def reset():
+    with _lock:
+        _values.clear()
+        _buckets.clear()
+
+
+def format_labels(labels):
+    return "{" + ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\")
+                         .replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    ) + "}"
+
+
+def render():
+    with _lock:
+        values = {name: dict(samples) for name, samples in _values.items()}
+        buckets = {labels: list(counts) for labels, counts in _buckets.items()}
+    lines = []
+    for name in COUNTERS:
+        lines.append(f"# TYPE yatube_{name} counter")
+        for labels, value in sorted(values.get(name, {}).items()):
+            lines.append(f"yatube_{name}{format_labels(labels)} {value}")
+    lines.append(f"# TYPE yatube_{HISTOGRAM} histogram")
+    for labels, counts in sorted(buckets.items()):
+        total = 0
+        for bound, count in zip(METRICS_BUCKETS + ("+Inf",), counts):
+            total += count
+            lines.append(f"yatube_{HISTOGRAM}_bucket"
+                         f"{format_labels(labels + (('le', bound),))} {total}")
+        duration = values[HISTOGRAM + "_sum"][labels]
+        lines.append(
+            f"yatube_{HISTOGRAM}_sum{format_labels(labels)} {duration}")
+        lines.append(
+            f"yatube_{HISTOGRAM}_count{format_labels(labels)} {total}")
+    return "\n".join(lines) + "\n"
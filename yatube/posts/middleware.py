@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+from posts import metrics, routers
+from posts.cache import (ALL_FEEDS, cache_response, feed_versions,
+                         get_cached_response)
+from posts.settings import (PAGE_CACHE, PAGE_CACHE_VIEWS, REPLICA_COOKIE,
+                            REPLICA_STICKY_SECONDS, SERVER_TIMING)
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        request_metrics, token = metrics.start()
+        try:
+            with metrics.instrument():
+                response = self.get_response(request)
+        finally:
+            metrics.stop(token)
+        return self.finish(request, response, request_metrics)
+
+    async def __acall__(self, request):
+        request_metrics, token = metrics.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.stop(token)
+        return self.finish(request, response, request_metrics)
+
+    def finish(self, request, response, request_metrics):
+        request_metrics.finish()
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        budget = metrics.query_budget(view)
+        if request_metrics.queries > budget:
+            logger.warning("Query budget exceeded by %s: %s of %s queries",
+                           view, request_metrics.queries, budget)
+        metrics.observe(view, response.status_code, request_metrics)
+        if SERVER_TIMING:
+            response["Server-Timing"] = request_metrics.server_timing(budget)
+        return response
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = routers.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            state = routers.stop(token)
+        return self.finish(response, state)
+
+    async def __acall__(self, request):
+        token = routers.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            state = routers.stop(token)
+        return self.finish(response, state)
+
+    def finish(self, response, state):
+        if state.wrote:
+            response.set_cookie(REPLICA_COOKIE, str(time.time()),
+                                max_age=REPLICA_STICKY_SECONDS,
+                                httponly=True, samesite="Lax")
+        return response
+
+
+class PageCacheMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not self.is_cacheable(request):
+            return self.get_response(request)
+        response = get_cached_response(request)
+        if response is not None:
+            return response
+        versions = feed_versions(ALL_FEEDS)
+        return self.finish(request, self.get_response(request), versions)
+
+    async def __acall__(self, request):
+        if not self.is_cacheable(request):
+            return await self.get_response(request)
+        response = await sync_to_async(get_cached_response)(request)
+        if response is not None:
+            return response
+        versions = await sync_to_async(feed_versions)(ALL_FEEDS)
+        response = await self.get_response(request)
+        return await sync_to_async(self.finish)(request, response, versions)
+
+    def is_cacheable(self, request):
+        if (not PAGE_CACHE or settings.DEBUG or
+                request.method not in ("GET", "HEAD") or
+                settings.SESSION_COOKIE_NAME in request.COOKIES or
+                REPLICA_COOKIE in request.COOKIES):
+            return False
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return match.view_name in PAGE_CACHE_VIEWS
+
+    def finish(self, request, response, versions):
+        validators = getattr(request, "page_validators", None)
+        if validators is None:
+            return cache_response(request, response, (ALL_FEEDS, ),
+                                  versions)
+        if validators.private:
+            return response
+        return cache_response(request, response, validators.scopes,
+                              validators.versions)
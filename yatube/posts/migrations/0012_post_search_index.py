@@ -0,0 +1,62 @@
+from django.db import migrations
+
+TABLE = "posts_post_search"
+
+
+def build_search_index(apps, schema_editor):
+    db = schema_editor.connection
+    if db.vendor not in ("sqlite", "postgresql"):
+        return
+    Post = apps.get_model("posts", "Post")
+    rows = Post.objects.using(db.alias).values_list(
+        "pk", "text", "group__title"
+    )
+    with db.cursor() as cursor:
+        if db.vendor == "sqlite":
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} "
+                "USING fts5(text, title, tokenize='unicode61')"
+            )
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (rowid, text, title) "
+                "VALUES (%s, %s, %s)",
+                [(post_id, text.lower(), (title or "").lower())
+                 for post_id, text, title in rows.iterator()]
+            )
+            return
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+            "post_id integer PRIMARY KEY "
+            "REFERENCES posts_post (id) ON DELETE CASCADE "
+            "DEFERRABLE INITIALLY DEFERRED, "
+            "document tsvector NOT NULL)"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {TABLE}_document "
+            f"ON {TABLE} USING gin (document)"
+        )
+        cursor.executemany(
+            f"INSERT INTO {TABLE} (post_id, document) VALUES (%s, "
+            "setweight(to_tsvector('russian', %s), 'A') || "
+            "setweight(to_tsvector('russian', %s), 'B'))",
+            [(post_id, text, title or "")
+             for post_id, text, title in rows.iterator()]
+        )
+
+
+def remove_search_index(apps, schema_editor):
+    db = schema_editor.connection
+    if db.vendor in ("sqlite", "postgresql"):
+        with db.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_search_index, remove_search_index),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.1.5 on 2026-10-18 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_auto_20261018_2147'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportedRecord',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=16, verbose_name='Тип записи: ')),
+                ('source_id', models.PositiveIntegerField(verbose_name='Номер в выгрузке: ')),
+                ('target_id', models.PositiveIntegerField(verbose_name='Номер в базе: ')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='importedrecord',
+            constraint=models.UniqueConstraint(fields=('kind', 'source_id'), name='imported_record'),
+        ),
+    ]
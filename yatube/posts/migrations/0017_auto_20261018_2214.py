@@ -0,0 +1,33 @@
+# Generated by Django 3.1.5 on 2026-10-18 22:14
+
+from django.db import migrations, models
+
+
+def fill_variants_keys(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    posts = Post.objects.exclude(image_variants={}).only("image_variants")
+    batch = []
+    for post in posts.iterator():
+        post.image_variants_key = post.image_variants.get("fallback", "")
+        batch.append(post)
+    Post.objects.bulk_update(batch, ["image_variants_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_auto_20261018_2207'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_variants_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Ключ вариантов изображения: '),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['image_variants_key'], name='post_image_variants'),
+        ),
+        migrations.RunPython(fill_variants_keys, migrations.RunPython.noop),
+    ]
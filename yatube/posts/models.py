@@ -27,6 +27,11 @@ class Group(models.Model):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    def for_feed(self):
+        return self.select_related("author", "group")
+
+
 class Post(models.Model):
     text = models.TextField(
         verbose_name="Текст заметки: ",
@@ -56,9 +61,38 @@ class Post(models.Model):
         verbose_name="Изображение: ",
         help_text="Можете выбрать картинку к посту."
     )
+    image_variants = models.JSONField(
+        verbose_name="Варианты изображения: ",
+        default=dict,
+        blank=True,
+        editable=False
+    )
+    image_variants_key = models.CharField(
+        verbose_name="Ключ вариантов изображения: ",
+        max_length=255,
+        default="",
+        blank=True,
+        editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        verbose_name="Комментариев: ",
+        default=0,
+        editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ("-pub_date", )
+        indexes = [
+            models.Index(fields=("-pub_date", "-id"), name="post_feed"),
+            models.Index(fields=("author", "-pub_date", "-id"),
+                         name="post_author_feed"),
+            models.Index(fields=("group", "-pub_date", "-id"),
+                         name="post_group_feed"),
+            models.Index(fields=("image_variants_key",),
+                         name="post_image_variants"),
+        ]
 
     def __str__(self):
         return self.text[:LETTERS_PER_STR]
@@ -86,6 +120,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ("-created", )
+        indexes = [
+            models.Index(fields=("post", "-created", "-id"),
+                         name="comment_post"),
+        ]
 
     def __str__(self):
         return self.text[:LETTERS_PER_STR]
@@ -114,3 +152,71 @@ class Follow(models.Model):
                 name="follow_pair"
             )
         ]
+        indexes = [
+            models.Index(fields=("author", "user"), name="follow_author"),
+        ]
+
+
+class UserStats(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name="stats",
+        verbose_name="Пользователь: "
+    )
+    followers_count = models.PositiveIntegerField(
+        verbose_name="Подписчиков: ", default=0
+    )
+    following_count = models.PositiveIntegerField(
+        verbose_name="Подписок: ", default=0
+    )
+    posts_count = models.PositiveIntegerField(
+        verbose_name="Записей: ", default=0
+    )
+
+    def __str__(self):
+        return str(self.user)
+
+
+class TimelineEntry(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="timeline",
+        verbose_name="Подписчик: "
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+        verbose_name="Заметка: "
+    )
+    pub_date = models.DateTimeField("date published")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("user", "post"),
+                name="timeline_entry"
+            )
+        ]
+        indexes = [
+            models.Index(fields=("user", "-pub_date", "-post"),
+                         name="timeline_feed")
+        ]
+
+
+class ImportedRecord(models.Model):
+    kind = models.CharField(verbose_name="Тип записи: ", max_length=16)
+    source_id = models.PositiveIntegerField(
+        verbose_name="Номер в выгрузке: "
+    )
+    target_id = models.PositiveIntegerField(verbose_name="Номер в базе: ")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("kind", "source_id"),
+                name="imported_record"
+            )
+        ]
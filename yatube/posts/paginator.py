@@ -0,0 +1,183 @@
+import base64
+import binascii
+import hashlib
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+
+from posts.settings import APPROXIMATE_COUNT_TIMEOUT
+
+NEXT = "n"
+PREVIOUS = "p"
+LAST = "last"
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return repr(float(value))
+
+
+def decode_value(value):
+    try:
+        value = datetime.fromisoformat(value)
+    except ValueError:
+        return float(value)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.utc)
+    return value
+
+
+def encode_cursor(direction, position):
+    value, pk = position
+    raw = "|".join((direction, encode_value(value), str(pk)))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        direction, value, pk = raw.split("|")
+        value = decode_value(value)
+        pk = int(pk)
+    except (binascii.Error, UnicodeError, ValueError) as error:
+        raise InvalidCursor(token) from error
+    if direction not in (NEXT, PREVIOUS):
+        raise InvalidCursor(token)
+    return direction, (value, pk)
+
+
+def approximate_count(queryset):
+    query = str(queryset.query).encode()
+    key = "approximate-count:" + hashlib.md5(query).hexdigest()
+    total = cache.get(key)
+    if total is None:
+        total = queryset.count()
+        cache.set(key, total, APPROXIMATE_COUNT_TIMEOUT)
+    return total
+
+
+def keyset(queryset, key, descending, position=None, pk="pk"):
+    ordering = (f"-{key}", f"-{pk}") if descending else (key, pk)
+    if position is None:
+        return queryset.order_by(*ordering)
+    value, pk_value = position
+    lookup = "lt" if descending else "gt"
+    try:
+        queryset = queryset.filter(
+            Q(**{f"{key}__{lookup}": value}) |
+            Q(**{key: value, f"{pk}__{lookup}": pk_value}),
+            **{f"{key}__{lookup}e": value}
+        )
+    except (TypeError, ValueError, ValidationError) as error:
+        raise InvalidCursor(value) from error
+    return queryset.order_by(*ordering)
+
+
+class CursorPaginator:
+    def __init__(self, object_list, per_page, key="pub_date",
+                 approximate_total=False):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.key = key
+        self.approximate_total = approximate_total
+
+    def position(self, obj):
+        if isinstance(obj, dict):
+            return obj[self.key], obj["id"]
+        return getattr(obj, self.key), obj.pk
+
+    def fetch(self, descending, position=None):
+        return list(keyset(self.object_list, self.key, descending,
+                           position)[:self.per_page + 1])
+
+    def page(self, cursor=None):
+        if not cursor:
+            return self._first_page()
+        if cursor == LAST:
+            return self._last_page()
+        direction, position = decode_cursor(cursor)
+        if direction == NEXT:
+            items = self.fetch(True, position)
+            return CursorPage(items[:self.per_page], self,
+                              has_next=len(items) > self.per_page,
+                              has_previous=True)
+        items = self.fetch(False, position)
+        has_previous = len(items) > self.per_page
+        items = items[:self.per_page][::-1]
+        if not has_previous and len(items) < self.per_page:
+            return self._first_page()
+        return CursorPage(items, self, has_next=True,
+                          has_previous=has_previous)
+
+    def get_page(self, cursor=None):
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self._first_page()
+
+    def _first_page(self):
+        items = self.fetch(True)
+        return CursorPage(items[:self.per_page], self,
+                          has_next=len(items) > self.per_page,
+                          has_previous=False)
+
+    def _last_page(self):
+        items = self.fetch(False)
+        return CursorPage(items[:self.per_page][::-1], self, has_next=False,
+                          has_previous=len(items) > self.per_page)
+
+    @property
+    def count(self):
+        if not self.approximate_total:
+            return None
+        return approximate_count(self.object_list)
+
+
+class CursorPage(Sequence):
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<CursorPage of {len(self)} items>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return encode_cursor(
+            NEXT, self.paginator.position(self.object_list[-1]))
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return encode_cursor(
+            PREVIOUS, self.paginator.position(self.object_list[0]))
@@ -0,0 +1,104 @@
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.db import connections
+
+from posts.settings import REPLICA_COOKIE, REPLICA_STICKY_SECONDS
+
+_state = ContextVar("replica_state", default=None)
+
+
+class ReplicaState:
+    def __init__(self, sticky=False):
+        self.sticky = sticky
+        self.reading = False
+        self.wrote = False
+
+    @property
+    def use_replica(self):
+        return self.reading and not self.sticky and not self.wrote
+
+
+def replica_aliases():
+    return [alias for alias in connections.databases if alias != "default"]
+
+
+def recently_wrote(request):
+    try:
+        written = float(request.COOKIES[REPLICA_COOKIE])
+    except (KeyError, ValueError):
+        return False
+    return time.time() - written < REPLICA_STICKY_SECONDS
+
+
+def start(request):
+    return _state.set(ReplicaState(sticky=recently_wrote(request)))
+
+
+def stop(token):
+    state = _state.get()
+    _state.reset(token)
+    return state
+
+
+@contextmanager
+def primary_reads(enabled=True):
+    state = _state.get()
+    if not enabled or state is None:
+        yield
+        return
+    sticky = state.sticky
+    state.sticky = True
+    try:
+        yield
+    finally:
+        state.sticky = sticky
+
+
+def read_replica(view):
+    if asyncio.iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            state = _state.get()
+            if state is not None:
+                state.reading = True
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                if state is not None:
+                    state.reading = False
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        state = _state.get()
+        if state is not None:
+            state.reading = True
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            if state is not None:
+                state.reading = False
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replica:
+            return None
+        replicas = replica_aliases()
+        return random.choice(replicas) if replicas else None
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
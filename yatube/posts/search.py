@@ -0,0 +1,101 @@
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from posts.models import Post
+from posts.stemmer import stem_words
+
+TABLE = "posts_post_search"
+TEXT_WEIGHT = 10.0
+TITLE_WEIGHT = 5.0
+
+
+def normalize(text):
+    return " ".join(stem_words(text or ""))
+
+
+def match_expression(query):
+    return " ".join(f'"{word}"*' for word in stem_words(query))
+
+
+def index_rows(db, rows):
+    rows = list(rows)
+    if not rows:
+        return
+    with db.cursor() as cursor:
+        if db.vendor == "sqlite":
+            cursor.executemany(
+                f"DELETE FROM {TABLE} WHERE rowid = %s",
+                [(post_id,) for post_id, text, title in rows]
+            )
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (rowid, text, title) "
+                "VALUES (%s, %s, %s)",
+                [(post_id, normalize(text), normalize(title))
+                 for post_id, text, title in rows]
+            )
+        elif db.vendor == "postgresql":
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (post_id, document) VALUES (%s, "
+                "setweight(to_tsvector('russian', %s), 'A') || "
+                "setweight(to_tsvector('russian', %s), 'B')) "
+                "ON CONFLICT (post_id) DO UPDATE "
+                "SET document = EXCLUDED.document",
+                [(post_id, text, title or "")
+                 for post_id, text, title in rows]
+            )
+
+
+def remove_rows(db, post_ids):
+    if db.vendor not in ("sqlite", "postgresql"):
+        return
+    column = "rowid" if db.vendor == "sqlite" else "post_id"
+    with db.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {TABLE} WHERE {column} = %s",
+                           [(post_id,) for post_id in post_ids])
+
+
+def index_posts(posts):
+    index_rows(connection, posts.values_list("pk", "text", "group__title"))
+
+
+def remove_posts(post_ids):
+    remove_rows(connection, post_ids)
+
+
+def match_join(query):
+    if connection.vendor == "sqlite":
+        return {
+            "tables": [TABLE],
+            "where": [f"{TABLE}.rowid = posts_post.id", f"{TABLE} MATCH %s"],
+            "params": [match_expression(query)],
+        }
+    return {
+        "tables": [TABLE],
+        "where": [f"{TABLE}.post_id = posts_post.id",
+                  f"{TABLE}.document @@ plainto_tsquery('russian', %s)"],
+        "params": [query],
+    }
+
+
+def rank_expression(query):
+    if connection.vendor == "sqlite":
+        return RawSQL(f"-bm25({TABLE}, %s, %s)",
+                      [TEXT_WEIGHT, TITLE_WEIGHT], output_field=FloatField())
+    return RawSQL(
+        f"ts_rank({TABLE}.document, plainto_tsquery('russian', %s))",
+        [query], output_field=FloatField()
+    )
+
+
+def search_posts(query):
+    posts = Post.objects.for_feed()
+    if not stem_words(query):
+        return posts.none().annotate(rank=Value(0.0, FloatField()))
+    if connection.vendor not in ("sqlite", "postgresql"):
+        return posts.filter(
+            Q(text__icontains=query) | Q(group__title__icontains=query)
+        ).annotate(rank=Value(0.0, FloatField()))
+    return posts.extra(**match_join(query)).annotate(
+        rank=rank_expression(query)
+    )
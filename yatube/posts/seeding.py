@@ -0,0 +1,116 @@
+import random
+import time
+from datetime import timedelta
+from io import BytesIO
+from itertools import accumulate
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image
+
+from posts import search, timeline
+from posts.cache import ALL_FEEDS, bump_on_commit
+from posts.counters import recount
+from posts.models import Comment, Follow, Group, Post, User
+
+BATCH_SIZE = 5000
+UPDATE_BATCH_SIZE = 500
+WORDS = (
+    "город", "лето", "дорога", "книга", "музыка", "утро", "работа", "море",
+    "история", "друзья", "кофе", "поезд", "вечер", "горы", "фотография",
+    "новости", "проект", "прогулка", "зима", "кино", "река", "песня",
+)
+SEED_IMAGE_NAME = "posts/seed.jpg"
+
+
+def zipf_weights(count, alpha):
+    return list(accumulate(1 / (rank + 1) ** alpha for rank in range(count)))
+
+
+def sentence(rng, length):
+    return " ".join(rng.choice(WORDS) for number in range(length))
+
+
+def seed_image():
+    if not default_storage.exists(SEED_IMAGE_NAME):
+        buffer = BytesIO()
+        Image.new("RGB", (1440, 508), (90, 120, 160)).save(buffer, "JPEG")
+        default_storage.save(SEED_IMAGE_NAME, ContentFile(buffer.getvalue()))
+    return SEED_IMAGE_NAME
+
+
+def seed(users=1000, groups=50, posts=10000, comments=20000,
+         follows_per_user=20, image_share=0.1, days=365, alpha=1.2,
+         rng=None):
+    rng = rng or random.Random()
+    prefix = f"seed-{int(time.time())}-{rng.randrange(10 ** 6)}"
+    User.objects.bulk_create(
+        (User(username=f"{prefix}-{number}") for number in range(users)),
+        batch_size=BATCH_SIZE
+    )
+    Group.objects.bulk_create(
+        (Group(title=f"{sentence(rng, 2).capitalize()} {number}",
+               slug=f"{prefix}-{number}", description=sentence(rng, 8))
+         for number in range(groups)),
+        batch_size=BATCH_SIZE
+    )
+    user_ids = list(User.objects.filter(
+        username__startswith=prefix).values_list("pk", flat=True))
+    group_ids = list(Group.objects.filter(
+        slug__startswith=prefix).values_list("pk", flat=True))
+    group_ids.append(None)
+    weights = zipf_weights(len(user_ids), alpha)
+    image = seed_image() if image_share else ""
+
+    started = timezone.now() - timedelta(days=days)
+    step = timedelta(days=days) / max(posts, 1)
+    for start in range(0, posts if user_ids else 0, BATCH_SIZE):
+        created = Post.objects.bulk_create(
+            Post(text=sentence(rng, rng.randint(5, 40)),
+                 author_id=rng.choices(user_ids, cum_weights=weights)[0],
+                 group_id=rng.choice(group_ids),
+                 image=image if rng.random() < image_share else "")
+            for number in range(min(BATCH_SIZE, posts - start))
+        )
+        if created[0].pk is None:
+            created = Post.objects.order_by("-pk")[:len(created)][::-1]
+        for number, post in enumerate(created, start):
+            post.pub_date = started + step * number
+        Post.objects.bulk_update(created, ["pub_date"],
+                                 batch_size=UPDATE_BATCH_SIZE)
+
+    follows = set()
+    for user_id in user_ids:
+        count = min(int(rng.paretovariate(alpha) * follows_per_user / 5),
+                    len(user_ids) - 1)
+        authors = rng.choices(user_ids, cum_weights=weights, k=count)
+        for author_id in authors:
+            if author_id != user_id:
+                follows.add((user_id, author_id))
+    Follow.objects.bulk_create(
+        (Follow(user_id=user_id, author_id=author_id)
+         for user_id, author_id in follows),
+        batch_size=BATCH_SIZE, ignore_conflicts=True
+    )
+
+    seeded = Post.objects.filter(author__username__startswith=prefix)
+    post_ids = list(seeded.values_list("pk", flat=True))
+    if post_ids:
+        post_weights = zipf_weights(len(post_ids), alpha)
+        rng.shuffle(post_ids)
+        for start in range(0, comments, BATCH_SIZE):
+            Comment.objects.bulk_create(
+                Comment(
+                    post_id=rng.choices(post_ids, cum_weights=post_weights)[0],
+                    author_id=rng.choice(user_ids),
+                    text=sentence(rng, rng.randint(3, 15))
+                )
+                for number in range(min(BATCH_SIZE, comments - start))
+            )
+
+    recount()
+    timeline.backfill_follows(follows)
+    search.index_posts(seeded)
+    bump_on_commit(ALL_FEEDS)
+    return prefix
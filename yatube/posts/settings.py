@@ -1,2 +1,51 @@
+import os
+
+from django.conf import settings
+
 POSTS_PER_PAGE = 10
+COMMENTS_PER_PAGE = 20
 LETTERS_PER_STR = 15
+FEED_APPROXIMATE_TOTAL = False
+APPROXIMATE_COUNT_TIMEOUT = 60 * 5
+FOLLOW_FEED_MATERIALIZED = False
+FANOUT_FOLLOWER_LIMIT = 1000
+TIMELINE_BATCH_SIZE = 1000
+TRANSFER_BATCH_SIZE = 1000
+LOCAL_CACHE_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",
+                        "django.core.cache.backends.dummy.DummyCache")
+SHARED_CACHE = (settings.CACHES["default"]["BACKEND"] not in
+                LOCAL_CACHE_BACKENDS)
+LOCAL_CACHE_TIMEOUT = 20
+FEED_CACHE_TIMEOUT = 60 * 5 if SHARED_CACHE else LOCAL_CACHE_TIMEOUT
+FOLLOW_GRAPH_TIMEOUT = 60 * 60 if SHARED_CACHE else LOCAL_CACHE_TIMEOUT
+PAGE_CACHE = True
+PAGE_CACHE_TIMEOUT = 60 * 5 if SHARED_CACHE else LOCAL_CACHE_TIMEOUT
+PAGE_CACHE_VIEWS = ("index", "group", "profile", "post", "about:author",
+                    "about:tech")
+PAGE_EDGE_MAX_AGE = 10
+STAMPEDE_BETA = 1.0
+STAMPEDE_LOCK_TIMEOUT = 10
+STAMPEDE_LOCK_WAIT = 2.0
+STAMPEDE_WAIT_STEP = 0.05
+IMAGE_VARIANT_ASPECT = (960, 339)
+IMAGE_VARIANT_WIDTHS = (480, 960, 1440)
+IMAGE_VARIANT_FORMATS = ("avif", "webp", "jpeg")
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_VARIANTS_DIR = "posts/variants"
+THUMBNAIL_QUEUE = "thread"
+THUMBNAIL_WORKERS = 2
+MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+MAX_IMAGE_PIXELS = 40 * 1000 * 1000
+MAX_IMAGE_SIDE = 10000
+SERVER_TIMING = os.environ.get("YATUBE_SERVER_TIMING", "") == "1"
+METRICS_TOKEN = os.environ.get("YATUBE_METRICS_TOKEN", "")
+QUERY_BUDGET = 10
+QUERY_BUDGETS = {}
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+ASYNC_VIEWS = os.environ.get("YATUBE_ASYNC_VIEWS", "") == "1"
+ASYNC_PARALLEL_QUERIES = True
+REPLICA_COOKIE = "recent_write"
+REPLICA_STICKY_SECONDS = 10
+API_COMPRESS_MIN_SIZE = 200
+API_BATCH_SIZE = 100
+API_JSON_PARAMS = {"ensure_ascii": False, "separators": (",", ":")}
@@ -0,0 +1,122 @@
+from contextvars import ContextVar
+
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from posts import search, thumbnails, timeline
+from posts.cache import ALL_FEEDS, bump_on_commit, post_scopes, user_scope
+from posts.counters import bump_comment_count, bump_user_stats
+from posts.models import Comment, Follow, Group, Post, User, UserStats
+
+_deleting_posts = ContextVar("deleting_posts", default=frozenset())
+
+
+@receiver(post_save, sender=User)
+def create_user_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        UserStats.objects.get_or_create(user=instance)
+
+
+@receiver(post_init, sender=Post)
+def post_loaded(sender, instance, **kwargs):
+    loaded = instance.__dict__
+    instance._loaded_group_id = loaded.get("group_id")
+    image = loaded.get("image")
+    instance._loaded_image = getattr(image, "name", image)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, raw=False, **kwargs):
+    bump_on_commit(*post_scopes(
+        instance.author_id, instance.group_id, instance._loaded_group_id
+    ))
+    instance._loaded_group_id = instance.group_id
+    if instance.image.name != instance._loaded_image and not created:
+        Post.objects.filter(pk=instance.pk).update(image_variants={},
+                                                   image_variants_key="")
+        thumbnails.schedule_cleanup(instance.image_variants)
+        instance.image_variants = {}
+        instance.image_variants_key = ""
+    if instance.image and instance.image.name != instance._loaded_image:
+        thumbnails.schedule(instance.pk)
+    instance._loaded_image = instance.image.name
+    search.index_posts(Post.objects.filter(pk=instance.pk))
+    if created and not raw:
+        bump_user_stats(instance.author_id, "posts_count", 1)
+        timeline.fan_out(instance)
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender, instance, **kwargs):
+    _deleting_posts.set(_deleting_posts.get() | {instance.pk})
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    _deleting_posts.set(_deleting_posts.get() - {instance.pk})
+    search.remove_posts([instance.pk])
+    bump_on_commit(*post_scopes(instance.author_id, instance.group_id))
+    bump_user_stats(instance.author_id, "posts_count", -1)
+
+
+def bump_comment_feeds(comment):
+    post = Post.objects.filter(pk=comment.post_id).values(
+        "author_id", "group_id"
+    ).first()
+    if post is not None:
+        bump_on_commit(*post_scopes(post["author_id"], post["group_id"]))
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        bump_comment_count(instance.post_id, 1)
+        bump_comment_feeds(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if instance.post_id in _deleting_posts.get():
+        return
+    bump_comment_count(instance.post_id, -1)
+    bump_comment_feeds(instance)
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, created, **kwargs):
+    bump_on_commit(ALL_FEEDS)
+    if not created:
+        search.index_posts(instance.posts.all())
+
+
+@receiver(pre_delete, sender=Group)
+def group_deleting(sender, instance, **kwargs):
+    instance._post_ids = list(instance.posts.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    bump_on_commit(ALL_FEEDS)
+    search.index_posts(Post.objects.filter(pk__in=instance._post_ids))
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        bump_user_stats(instance.author_id, "followers_count", 1)
+        bump_user_stats(instance.user_id, "following_count", 1)
+        timeline.backfill(instance.user_id, instance.author_id)
+        timeline.followers_changed(instance.author_id, 1)
+        bump_on_commit(user_scope(instance.user_id),
+                       user_scope(instance.author_id))
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    bump_user_stats(instance.author_id, "followers_count", -1)
+    bump_user_stats(instance.user_id, "following_count", -1)
+    timeline.prune(instance.user_id, instance.author_id)
+    timeline.followers_changed(instance.author_id, -1)
+    bump_on_commit(user_scope(instance.user_id),
+                   user_scope(instance.author_id))
@@ -0,0 +1,105 @@
+import re
+from functools import lru_cache
+
+VOWELS = "аеиоуыэюя"
+WORD_RE = re.compile(r"\w+")
+STEM_CACHE_SIZE = 50000
+
+PERFECTIVE_GERUND = (
+    (("в", "вши", "вшись"), True),
+    (("ив", "ивши", "ившись", "ыв", "ывши", "ывшись"), False),
+)
+ADJECTIVE = (
+    (("ее", "ие", "ые", "ое", "ими", "ыми", "ей", "ий", "ый", "ой", "ем",
+      "им", "ым", "ом", "его", "ого", "ему", "ому", "их", "ых", "ую", "юю",
+      "ая", "яя", "ою", "ею"), False),
+)
+PARTICIPLE = (
+    (("ем", "нн", "вш", "ющ", "щ"), True),
+    (("ивш", "ывш", "ующ"), False),
+)
+REFLEXIVE = ((("ся", "сь"), False),)
+VERB = (
+    (("ла", "на", "ете", "йте", "ли", "й", "л", "ем", "н", "ло", "но", "ет",
+      "ют", "ны", "ть", "ешь", "нно"), True),
+    (("ила", "ыла", "ена", "ейте", "уйте", "ите", "или", "ыли", "ей", "уй",
+      "ил", "ыл", "им", "ым", "ен", "ило", "ыло", "ено", "ят", "ует", "уют",
+      "ит", "ыт", "ены", "ить", "ыть", "ишь", "ую", "ю"), False),
+)
+NOUN = (
+    (("а", "ев", "ов", "ие", "ье", "е", "иями", "ями", "ами", "еи", "ии",
+      "и", "ией", "ей", "ой", "ий", "й", "иям", "ям", "ием", "ем", "ам",
+      "ом", "о", "у", "ах", "иях", "ях", "ы", "ь", "ию", "ью", "ю", "ия",
+      "ья", "я"), False),
+)
+DERIVATIONAL = ((("ост", "ость"), False),)
+SUPERLATIVE = ((("ейш", "ейше"), False),)
+
+
+def regions(word):
+    rv = r1 = r2 = len(word)
+    for index, letter in enumerate(word):
+        if letter in VOWELS:
+            rv = index + 1
+            break
+    for index in range(1, len(word)):
+        if word[index] not in VOWELS and word[index - 1] in VOWELS:
+            r1 = index + 1
+            break
+    for index in range(r1 + 1, len(word)):
+        if word[index] not in VOWELS and word[index - 1] in VOWELS:
+            r2 = index + 1
+            break
+    return rv, r2
+
+
+def remove_ending(word, start, groups):
+    candidates = [
+        (ending, after_a) for endings, after_a in groups
+        for ending in endings
+        if word.endswith(ending) and len(word) - len(ending) >= start
+    ]
+    if not candidates:
+        return word, False
+    ending, after_a = max(candidates, key=lambda item: len(item[0]))
+    stem = word[:-len(ending)]
+    if after_a and not (len(stem) > start and stem[-1] in "ая"):
+        return word, False
+    return stem, True
+
+
+def undouble_n(word, rv):
+    if word.endswith("нн") and len(word) - 2 >= rv:
+        return word[:-1]
+    return word
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem(word):
+    word = word.lower().replace("ё", "е")
+    rv, r2 = regions(word)
+    word, removed = remove_ending(word, rv, PERFECTIVE_GERUND)
+    if not removed:
+        word, removed = remove_ending(word, rv, REFLEXIVE)
+        word, removed = remove_ending(word, rv, ADJECTIVE)
+        if removed:
+            word, removed = remove_ending(word, rv, PARTICIPLE)
+        else:
+            word, removed = remove_ending(word, rv, VERB)
+            if not removed:
+                word, removed = remove_ending(word, rv, NOUN)
+    if word.endswith("и") and len(word) - 1 >= rv:
+        word = word[:-1]
+    word, removed = remove_ending(word, r2, DERIVATIONAL)
+    word, removed = remove_ending(word, rv, SUPERLATIVE)
+    if removed:
+        return undouble_n(word, rv)
+    if word.endswith("нн"):
+        return undouble_n(word, rv)
+    if word.endswith("ь") and len(word) - 1 >= rv:
+        return word[:-1]
+    return word
+
+
+def stem_words(text):
+    return [stem(word) for word in WORD_RE.findall(text.lower())]
@@ -0,0 +1,30 @@
+from django import template
+
+from posts.paginator import LAST
+
+register = template.Library()
+
+
+def cursor_url(request, cursor=None):
+    query = request.GET.copy()
+    query.pop("cursor", None)
+    if cursor:
+        query["cursor"] = cursor
+    if not query:
+        return request.path
+    return "?" + query.urlencode()
+
+
+@register.inclusion_tag("include/paginator.html", takes_context=True)
+def pager(context, page):
+    request = context["request"]
+    if not page.has_other_pages():
+        return {"pages": False}
+    return {
+        "pages": True,
+        "first_url": cursor_url(request) if page.has_previous() else None,
+        "previous_url": cursor_url(request, page.previous_cursor),
+        "next_url": cursor_url(request, page.next_cursor),
+        "last_url": cursor_url(request, LAST) if page.has_next() else None,
+        "total": page.paginator.count,
+    }
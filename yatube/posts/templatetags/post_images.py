@@ -0,0 +1,30 @@
+from django import template
+from django.core.files.storage import default_storage
+
+register = template.Library()
+
+SIZES = "(max-width: 960px) 100vw, 960px"
+
+
+@register.inclusion_tag("posts/include/post_picture.html")
+def post_picture(post):
+    variants = post.image_variants
+    if not post.image or not variants:
+        return {"ready": False}
+    return {
+        "ready": True,
+        "sizes": SIZES,
+        "sources": [
+            {
+                "type": source["type"],
+                "srcset": ", ".join(
+                    f"{default_storage.url(name)} {width}w"
+                    for name, width in source["files"]
+                ),
+            }
+            for source in variants["sources"]
+        ],
+        "fallback": default_storage.url(variants["fallback"]),
+        "width": variants["width"],
+        "height": variants["height"],
+    }
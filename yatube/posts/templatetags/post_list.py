@@ -0,0 +1,34 @@
+from django import template
+from django.urls import reverse
+
+register = template.Library()
+
+
+def post_urls(post, user, url):
+    author = post.author.username
+    return {
+        "profile": url("profile", author),
+        "group": url("group", post.group.slug) if post.group else None,
+        "comment": url("add_comment", author, post.pk),
+        "edit": (url("post_edit", author, post.pk)
+                 if user is not None and user.pk == post.author_id else None),
+    }
+
+
+@register.inclusion_tag("posts/include/post_list.html", takes_context=True)
+def post_list(context, posts):
+    user = context.get("user")
+    reversed_urls = {}
+
+    def url(name, *args):
+        key = (name, *args)
+        if key not in reversed_urls:
+            reversed_urls[key] = reverse(name, args=args)
+        return reversed_urls[key]
+
+    return {"items": [(post, post_urls(post, user, url)) for post in posts]}
+
+
+@register.inclusion_tag("posts/include/post_list.html", takes_context=True)
+def post_card(context, post):
+    return post_list(context, [post])
@@ -11,13 +11,14 @@ FOLLOWER = "test-follower"
 POST_TEXT = "test-post"
 POST_NEW_TEXT = "test-edit-post"
 COMMENT_TEXT = "test-comment"
-FIRST_IMG_NAME = "img-1"
-SECOND_IMG_NAME = "img-2"
+FIRST_IMG_NAME = "img-1.gif"
+SECOND_IMG_NAME = "img-2.gif"
 
 INDEX_URL = reverse("index")
 SIGNUP_URL = reverse_lazy("login")
 NEW_POST_URL = reverse("new_post")
 FOLLOW_INDEX_URL = reverse("follow_index")
+METRICS_URL = reverse("metrics")
 AUTHOR_URL = reverse("about:author")
 TECH_URL = reverse("about:tech")
 PAGE_NOT_FOUND_URL = reverse("404")
@@ -30,6 +31,13 @@ FOLLOWER_URL = reverse("profile", args=[FOLLOWER])
 PROFILE_FOLLOW_URL = reverse("profile_follow", args=[USERNAME])
 PROFILE_UNFOLLOW_URL = reverse("profile_unfollow", args=[USERNAME])
 
+API_INDEX_URL = reverse("api:index")
+API_FOLLOW_INDEX_URL = reverse("api:follow_index")
+API_GROUP_URL = reverse("api:group", args=[FIRST_GROUP_SLUG])
+API_PROFILE_URL = reverse("api:profile", args=[USERNAME])
+API_CREATE_POSTS_URL = reverse("api:create_posts")
+API_CREATE_COMMENTS_URL = reverse("api:create_comments")
+
 NOT_URL = "not" + PAGE_NOT_FOUND_URL
 
 INDEX_TEMPLATE = "index.html"
@@ -0,0 +1,131 @@
+import gzip
+import json
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+import posts.tests.constants as consts
+from posts.models import Comment, Follow, Group, Post, User
+from posts.settings import COMMENTS_PER_PAGE, POSTS_PER_PAGE
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.follower = User.objects.create(username=consts.FOLLOWER)
+        cls.group = Group.objects.create(
+            title=consts.FIRST_GROUP_NAME, slug=consts.FIRST_GROUP_SLUG,
+            description=consts.FIRST_GROUP_DESCRIPTION
+        )
+        Post.objects.bulk_create(
+            Post(text=f"{consts.POST_TEXT}-{number}", author=cls.user,
+                 group=cls.group)
+            for number in range(POSTS_PER_PAGE + 3)
+        )
+        cls.post = Post.objects.create(text=consts.POST_TEXT, author=cls.user,
+                                       group=cls.group)
+        for number in range(COMMENTS_PER_PAGE + 1):
+            Comment.objects.create(post=cls.post, author=cls.follower,
+                                   text=f"{consts.COMMENT_TEXT}-{number}")
+        Follow.objects.create(user=cls.follower, author=cls.user)
+        cls.POST_URL = reverse("api:post", args=[consts.USERNAME,
+                                                 cls.post.id])
+        cls.COMMENTS_URL = reverse("api:post_comments",
+                                   args=[consts.USERNAME, cls.post.id])
+        cls.guest = Client()
+        cls.authorized_follower = Client()
+        cls.authorized_follower.force_login(cls.follower)
+
+    def setUp(self):
+        cache.clear()
+
+    def get_json(self, url, client=None, status=200, **extra):
+        response = (client or self.guest).get(url, **extra)
+        self.assertEqual(response.status_code, status)
+        self.assertEqual(response["Content-Type"], "application/json")
+        return json.loads(response.content)
+
+    def test_feeds(self):
+        CHECK_URLS = {
+            consts.API_INDEX_URL: self.guest,
+            consts.API_GROUP_URL: self.guest,
+            consts.API_PROFILE_URL: self.guest,
+            consts.API_FOLLOW_INDEX_URL: self.authorized_follower,
+        }
+        for url, client in CHECK_URLS.items():
+            with self.subTest(url=url):
+                data = self.get_json(url, client)
+                self.assertEqual(len(data["results"]), POSTS_PER_PAGE)
+                self.assertIsNone(data["previous"])
+                first = data["results"][0]
+                self.assertEqual(first["id"], self.post.id)
+                self.assertEqual(first["author"], consts.USERNAME)
+                self.assertEqual(first["group"], consts.FIRST_GROUP_SLUG)
+                self.assertIsNone(first["image"])
+                self.assertEqual(first["comment_count"],
+                                 COMMENTS_PER_PAGE + 1)
+                rest = self.get_json(url + "?cursor=" + data["next"], client)
+                self.assertEqual(len(rest["results"]), 4)
+                self.assertIsNone(rest["next"])
+                self.assertIsNotNone(rest["previous"])
+
+    def test_feed_queries(self):
+        with self.assertNumQueries(1):
+            self.get_json(consts.API_INDEX_URL)
+        with self.assertNumQueries(0):
+            self.get_json(consts.API_INDEX_URL)
+
+    def test_sparse_fields(self):
+        data = self.get_json(consts.API_INDEX_URL + "?fields=id,author")
+        self.assertEqual(set(data["results"][0]), {"id", "author"})
+        data = self.get_json(consts.API_INDEX_URL + "?fields=text")
+        self.assertEqual(set(data["results"][0]), {"text"})
+        rest = self.get_json(consts.API_INDEX_URL + "?fields=text&cursor=" +
+                             data["next"])
+        self.assertEqual(len(rest["results"]), 4)
+        data = self.get_json(self.POST_URL + "?fields=text,pub_date")
+        self.assertEqual(data["text"], consts.POST_TEXT)
+        self.assertEqual(set(data), {"text", "pub_date"})
+        error = self.get_json(consts.API_INDEX_URL + "?fields=id,password",
+                              status=400)
+        self.assertIn("password", error["detail"])
+
+    def test_post_and_comments(self):
+        data = self.get_json(self.POST_URL)
+        self.assertEqual(data["id"], self.post.id)
+        self.assertEqual(data["text"], consts.POST_TEXT)
+        data = self.get_json(self.COMMENTS_URL)
+        self.assertEqual(len(data["results"]), COMMENTS_PER_PAGE)
+        self.assertEqual(data["results"][0]["author"], consts.FOLLOWER)
+        rest = self.get_json(self.COMMENTS_URL + "?cursor=" + data["next"])
+        self.assertEqual(len(rest["results"]), 1)
+
+    def test_errors(self):
+        self.get_json(reverse("api:post", args=[consts.FOLLOWER,
+                                                self.post.id]), status=404)
+        self.get_json(reverse("api:group", args=[consts.SECOND_GROUP_SLUG]),
+                      status=404)
+        self.get_json(reverse("api:post_comments", args=[consts.FOLLOWER,
+                                                         self.post.id]),
+                      status=404)
+        self.get_json(consts.API_FOLLOW_INDEX_URL, status=401)
+        response = self.authorized_follower.post(consts.API_INDEX_URL)
+        self.assertEqual(response.status_code, 405)
+
+    def test_compression(self):
+        plain = self.guest.get(consts.API_INDEX_URL)
+        self.assertNotIn("Content-Encoding", plain)
+        response = self.guest.get(consts.API_INDEX_URL,
+                                  HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertTrue(response["ETag"].startswith("W/"))
+        revalidated = self.guest.get(consts.API_INDEX_URL,
+                                     HTTP_ACCEPT_ENCODING="gzip",
+                                     HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(revalidated.status_code, 304)
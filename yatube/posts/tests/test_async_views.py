@@ -0,0 +1,78 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import Http404
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+import posts.tests.constants as consts
+from posts import async_views, views
+from posts.models import Comment, Follow, Post, User
+
+
+@mock.patch("posts.async_views.ASYNC_PARALLEL_QUERIES", False)
+class AsyncViewsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.follower = User.objects.create(username=consts.FOLLOWER)
+        Follow.objects.create(user=cls.follower, author=cls.user)
+        cls.post = Post.objects.create(text=consts.POST_TEXT, author=cls.user)
+        Comment.objects.create(post=cls.post, author=cls.follower,
+                               text=consts.COMMENT_TEXT)
+        cls.POST_URL = reverse("post", args=[consts.USERNAME, cls.post.id])
+        cls.factory = RequestFactory()
+
+    def setUp(self):
+        cache.clear()
+
+    def request(self, url, user):
+        request = self.factory.get(url)
+        request.user = user
+        return request
+
+    def test_async_views_match_sync_views(self):
+        CHECK_VIEWS = {
+            "index": ("index", consts.INDEX_URL, {}),
+            "profile": ("profile", consts.PROFILE_URL,
+                        {"username": consts.USERNAME}),
+            "post": ("post_view", self.POST_URL,
+                     {"username": consts.USERNAME,
+                      "post_id": self.post.id}),
+        }
+        for name, (view, url, kwargs) in CHECK_VIEWS.items():
+            with self.subTest(view=name):
+                sync_response = getattr(views, view)(
+                    self.request(url, AnonymousUser()), **kwargs)
+                async_response = async_to_sync(getattr(async_views, view))(
+                    self.request(url, AnonymousUser()), **kwargs)
+                self.assertEqual(async_response.status_code, 200)
+                self.assertEqual(async_response.content,
+                                 sync_response.content)
+
+    def test_async_profile_following(self):
+        response = async_to_sync(async_views.profile)(
+            self.request(consts.PROFILE_URL, self.follower),
+            username=consts.USERNAME
+        )
+        self.assertContains(response, consts.PROFILE_UNFOLLOW_URL)
+
+    def test_async_not_modified(self):
+        response = async_to_sync(async_views.index)(
+            self.request(consts.INDEX_URL, AnonymousUser())
+        )
+        request = self.factory.get(consts.INDEX_URL,
+                                   HTTP_IF_NONE_MATCH=response["ETag"])
+        request.user = AnonymousUser()
+        response = async_to_sync(async_views.index)(request)
+        self.assertEqual(response.status_code, 304)
+
+    def test_async_post_view_not_found(self):
+        with self.assertRaises(Http404):
+            async_to_sync(async_views.post_view)(
+                self.request(self.POST_URL, AnonymousUser()),
+                username=consts.FOLLOWER, post_id=self.post.id
+            )
@@ -0,0 +1,109 @@
+import json
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+import posts.tests.constants as consts
+from posts.models import Comment, Group, Post, User
+from posts.settings import API_BATCH_SIZE
+
+
+class BatchApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.follower = User.objects.create(username=consts.FOLLOWER)
+        cls.group = Group.objects.create(
+            title=consts.FIRST_GROUP_NAME, slug=consts.FIRST_GROUP_SLUG,
+            description=consts.FIRST_GROUP_DESCRIPTION
+        )
+        cls.post = Post.objects.create(text=consts.POST_TEXT, author=cls.user)
+        cls.guest = Client()
+        cls.authorized_user = Client()
+        cls.authorized_user.force_login(cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def send(self, url, items, client=None, status=200):
+        response = (client or self.authorized_user).post(
+            url, json.dumps({"items": items}),
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status)
+        return json.loads(response.content)
+
+    def test_create_posts(self):
+        self.guest.get(consts.INDEX_URL)
+        items = [
+            {"text": consts.POST_NEW_TEXT, "group": self.group.pk},
+            {"text": ""},
+            {"text": consts.POST_NEW_TEXT, "group": 0},
+            {"text": consts.POST_NEW_TEXT},
+        ]
+        data = self.send(consts.API_CREATE_POSTS_URL, items)
+        self.assertEqual((data["created"], data["invalid"]), (2, 2))
+        statuses = [result["status"] for result in data["results"]]
+        self.assertEqual(statuses, ["created", "invalid", "invalid",
+                                    "created"])
+        self.assertIn("text", data["results"][1]["errors"])
+        self.assertIn("group", data["results"][2]["errors"])
+        first = Post.objects.get(pk=data["results"][0]["id"])
+        self.assertEqual(first.group, self.group)
+        self.assertEqual(first.author, self.user)
+        last = Post.objects.get(pk=data["results"][3]["id"])
+        self.assertIsNone(last.group)
+        self.user.stats.refresh_from_db()
+        self.assertEqual(self.user.stats.posts_count, 3)
+        self.assertContains(self.guest.get(consts.INDEX_URL),
+                            consts.POST_NEW_TEXT)
+        self.assertContains(self.guest.get(consts.FIRST_GROUP_URL),
+                            consts.POST_NEW_TEXT)
+
+    def test_create_comments(self):
+        self.guest.get(consts.PROFILE_URL)
+        items = [
+            {"post": self.post.pk, "text": consts.COMMENT_TEXT},
+            {"post": self.post.pk, "text": consts.COMMENT_TEXT},
+            {"post": 0, "text": consts.COMMENT_TEXT},
+            {"post": self.post.pk},
+        ]
+        data = self.send(consts.API_CREATE_COMMENTS_URL, items)
+        self.assertEqual((data["created"], data["invalid"]), (2, 2))
+        self.assertIn("__all__", data["results"][2]["errors"])
+        self.assertIn("text", data["results"][3]["errors"])
+        comments = Comment.objects.filter(post=self.post)
+        self.assertEqual(
+            set(comments.values_list("pk", flat=True)),
+            {result["id"] for result in data["results"][:2]}
+        )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 2)
+        self.assertNotContains(self.guest.get(consts.PROFILE_URL),
+                               "Комментариев: 0")
+
+    def test_batch_is_constant_in_queries(self):
+        self.send(consts.API_CREATE_POSTS_URL, [{"text": consts.POST_TEXT}])
+        with self.assertNumQueries(10):
+            self.send(consts.API_CREATE_POSTS_URL,
+                      [{"text": consts.POST_TEXT}] * 2)
+        with self.assertNumQueries(10):
+            self.send(consts.API_CREATE_POSTS_URL,
+                      [{"text": consts.POST_TEXT}] * 20)
+
+    def test_rejected_batches(self):
+        self.send(consts.API_CREATE_POSTS_URL, [{"text": consts.POST_TEXT}],
+                  client=self.guest, status=401)
+        self.send(consts.API_CREATE_POSTS_URL, [], status=400)
+        self.send(consts.API_CREATE_POSTS_URL,
+                  [{"text": consts.POST_TEXT}] * (API_BATCH_SIZE + 1),
+                  status=400)
+        response = self.authorized_user.post(
+            consts.API_CREATE_COMMENTS_URL, "{",
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.authorized_user.get(consts.API_CREATE_POSTS_URL)
+        self.assertEqual(response.status_code, 405)
+        self.assertFalse(Post.objects.exclude(pk=self.post.pk).exists())
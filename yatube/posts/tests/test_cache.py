@@ -0,0 +1,107 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+import posts.tests.constants as consts
+from posts.cache import feed_version, index_scope
+from posts.checks import check_shared_cache
+from posts.models import Group, Post, User
+from posts.settings import POSTS_PER_PAGE
+
+
+def run_immediately(callback):
+    callback()
+
+
+class FeedCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.follower = User.objects.create(username=consts.FOLLOWER)
+        cls.group = Group.objects.create(
+            title=consts.FIRST_GROUP_NAME,
+            slug=consts.FIRST_GROUP_SLUG,
+            description=consts.FIRST_GROUP_DESCRIPTION
+        )
+        cls.second_group = Group.objects.create(
+            title=consts.SECOND_GROUP_NAME,
+            slug=consts.SECOND_GROUP_SLUG,
+            description=consts.SECOND_GROUP_DESCRIPTION
+        )
+        cls.guest = Client()
+        cls.authorized_user = Client()
+        cls.authorized_user.force_login(cls.user)
+        cls.authorized_follower = Client()
+        cls.authorized_follower.force_login(cls.follower)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_pages_are_cached_separately(self):
+        for post_item in range(POSTS_PER_PAGE + 1):
+            Post.objects.create(text=f"{consts.POST_TEXT}-{post_item}",
+                                author=self.user)
+        first_page = self.guest.get(consts.INDEX_URL)
+        second_page = self.guest.get(
+            consts.INDEX_URL + "?cursor=" +
+            first_page.context["page"].next_cursor
+        )
+        self.assertIn(f"{consts.POST_TEXT}-0".encode(), second_page.content)
+        self.assertNotIn(f"{consts.POST_TEXT}-0".encode(), first_page.content)
+
+    def test_edit_button_does_not_leak(self):
+        post = Post.objects.create(text=consts.POST_TEXT, author=self.user)
+        edit_url = reverse("post_edit", args=[self.user.username, post.id])
+        self.assertContains(self.authorized_user.get(consts.INDEX_URL),
+                            edit_url)
+        self.assertNotContains(self.authorized_follower.get(consts.INDEX_URL),
+                               edit_url)
+        self.assertNotContains(self.guest.get(consts.INDEX_URL), edit_url)
+
+    def test_local_cache_deploy_check(self):
+        with mock.patch("posts.checks.SHARED_CACHE", False):
+            self.assertEqual([warning.id for warning in
+                              check_shared_cache(None)], ["posts.W001"])
+        with mock.patch("posts.checks.SHARED_CACHE", True):
+            self.assertEqual(check_shared_cache(None), [])
+
+    def test_versions_change_after_commit(self):
+        callbacks = []
+        version = feed_version(index_scope())
+        with mock.patch("posts.cache.transaction.on_commit",
+                        callbacks.append):
+            Post.objects.create(text=consts.POST_TEXT, author=self.user)
+        self.assertEqual(feed_version(index_scope()), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(feed_version(index_scope()), version)
+
+    @mock.patch("posts.cache.transaction.on_commit", run_immediately)
+    def test_writes_invalidate_feeds(self):
+        post = Post.objects.create(text=consts.POST_TEXT, author=self.user,
+                                   group=self.group)
+        urls = (consts.INDEX_URL, consts.FIRST_GROUP_URL, consts.PROFILE_URL)
+        for url in urls:
+            self.guest.get(url)
+        self.authorized_user.post(
+            reverse("post_edit", args=[self.user.username, post.id]),
+            {"text": consts.POST_NEW_TEXT, "group": self.second_group.id}
+        )
+        for url in (consts.INDEX_URL, consts.PROFILE_URL,
+                    consts.SECOND_GROUP_URL):
+            with self.subTest(url=url):
+                self.assertContains(self.guest.get(url), consts.POST_NEW_TEXT)
+        self.assertNotContains(self.guest.get(consts.FIRST_GROUP_URL),
+                               consts.POST_NEW_TEXT)
+        self.authorized_follower.post(
+            reverse("add_comment", args=[self.user.username, post.id]),
+            {"text": consts.COMMENT_TEXT}
+        )
+        self.assertContains(self.guest.get(consts.INDEX_URL),
+                            "Комментариев: 1")
+        post.delete()
+        self.assertNotContains(self.guest.get(consts.INDEX_URL),
+                               consts.POST_NEW_TEXT)
@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+import posts.tests.constants as consts
+from posts.counters import recount
+from posts.models import Comment, Post, User
+from posts.settings import COMMENTS_PER_PAGE
+
+COMMENTS = 2 * COMMENTS_PER_PAGE + 1
+COMMENTS_LIST_TEMPLATE = "posts/include/comment_list.html"
+
+
+class CommentPaginationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.follower = User.objects.create(username=consts.FOLLOWER)
+        cls.post = Post.objects.create(text=consts.POST_TEXT, author=cls.user)
+        Comment.objects.bulk_create(
+            Comment(post=cls.post, author=cls.follower,
+                    text=f"{consts.COMMENT_TEXT}-{number}")
+            for number in range(COMMENTS)
+        )
+        recount()
+        cls.POST_URL = reverse("post", args=[consts.USERNAME, cls.post.id])
+        cls.COMMENTS_URL = reverse("post_comments",
+                                   args=[consts.USERNAME, cls.post.id])
+        cls.guest = Client()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_post_first_comments_page(self):
+        with self.assertNumQueries(2):
+            response = self.guest.get(self.POST_URL)
+        comments = response.context["comments"]
+        self.assertEqual(len(comments), COMMENTS_PER_PAGE)
+        self.assertTrue(comments.has_next())
+        self.assertEqual(list(comments), list(
+            Comment.objects.order_by("-created", "-pk")[:COMMENTS_PER_PAGE]
+        ))
+        self.assertContains(response, f"({COMMENTS})")
+        self.assertContains(response, comments.next_cursor)
+
+    def test_comments_fragment(self):
+        cursor = self.guest.get(self.POST_URL).context["comments"].next_cursor
+        response = self.guest.get(self.COMMENTS_URL, {"cursor": cursor})
+        self.assertTemplateUsed(response, COMMENTS_LIST_TEMPLATE)
+        self.assertTemplateNotUsed(response, consts.POST_TEMPLATE)
+        self.assertEqual(len(response.context["comments"]), COMMENTS_PER_PAGE)
+
+    def test_comments_json_pages(self):
+        seen = []
+        params = {"format": "json"}
+        while True:
+            data = self.guest.get(self.COMMENTS_URL, params).json()
+            seen.extend(comment["id"] for comment in data["comments"])
+            if data["next"] is None:
+                break
+            params["cursor"] = data["next"]
+        self.assertEqual(seen, list(Comment.objects.order_by(
+            "-created", "-pk").values_list("pk", flat=True)))
+
+    def test_comments_of_other_author(self):
+        url = reverse("post_comments", args=[consts.FOLLOWER, self.post.id])
+        response = self.guest.get(url, {"format": "json"})
+        self.assertEqual(response.status_code, 404)
+        url = reverse("post_comments", args=[consts.USERNAME,
+                                             self.post.id + 1])
+        self.assertEqual(self.guest.get(url).status_code, 404)
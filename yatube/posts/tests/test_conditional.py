@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+import posts.tests.constants as consts
+from posts.models import Comment, Follow, Group, Post, User
+
+
+def run_immediately(callback):
+    callback()
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.follower = User.objects.create(username=consts.FOLLOWER)
+        cls.group = Group.objects.create(
+            title=consts.FIRST_GROUP_NAME, slug=consts.FIRST_GROUP_SLUG,
+            description=consts.FIRST_GROUP_DESCRIPTION
+        )
+        cls.post = Post.objects.create(text=consts.POST_TEXT, author=cls.user,
+                                       group=cls.group)
+        cls.POST_URL = reverse("post", args=[consts.USERNAME, cls.post.id])
+        cls.guest = Client()
+        cls.authorized_follower = Client()
+        cls.authorized_follower.force_login(cls.follower)
+
+    def setUp(self):
+        cache.clear()
+
+    def revalidate(self, client, url, response):
+        return client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    def test_not_modified(self):
+        for url in (consts.INDEX_URL, consts.FIRST_GROUP_URL,
+                    consts.PROFILE_URL, self.POST_URL):
+            with self.subTest(url=url):
+                response = self.guest.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("Cookie", response["Vary"])
+                self.assertIn("no-cache", response["Cache-Control"])
+                revalidated = self.revalidate(self.guest, url, response)
+                self.assertEqual(revalidated.status_code, 304)
+                self.assertEqual(revalidated.content, b"")
+                self.assertEqual(revalidated["ETag"], response["ETag"])
+                revalidated = self.guest.get(
+                    url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+                )
+                self.assertEqual(revalidated.status_code, 304)
+
+    def test_not_modified_index_without_queries(self):
+        response = self.guest.get(consts.INDEX_URL)
+        with self.assertNumQueries(0):
+            revalidated = self.revalidate(self.guest, consts.INDEX_URL,
+                                          response)
+        self.assertEqual(revalidated.status_code, 304)
+
+    @mock.patch("posts.cache.transaction.on_commit", run_immediately)
+    def test_changes_invalidate_validators(self):
+        CHANGES = {
+            "new post": (consts.INDEX_URL, lambda: Post.objects.create(
+                text=consts.POST_NEW_TEXT, author=self.follower)),
+            "group post": (consts.FIRST_GROUP_URL, lambda: Post.objects.create(
+                text=consts.POST_NEW_TEXT, author=self.follower,
+                group=self.group)),
+            "follow": (consts.PROFILE_URL, lambda: Follow.objects.create(
+                user=self.follower, author=self.user)),
+            "comment": (self.POST_URL, lambda: Comment.objects.create(
+                post=self.post, author=self.follower,
+                text=consts.COMMENT_TEXT)),
+        }
+        for name, (url, change) in CHANGES.items():
+            with self.subTest(change=name):
+                response = self.guest.get(url)
+                change()
+                revalidated = self.revalidate(self.guest, url, response)
+                self.assertEqual(revalidated.status_code, 200)
+                self.assertNotEqual(revalidated["ETag"], response["ETag"])
+
+    def test_authenticated_validators(self):
+        guest_response = self.guest.get(consts.INDEX_URL)
+        response = self.authorized_follower.get(consts.INDEX_URL)
+        self.assertNotEqual(response["ETag"], guest_response["ETag"])
+        self.assertNotIn("Last-Modified", response)
+        self.assertIn("private", response["Cache-Control"])
+        revalidated = self.revalidate(self.authorized_follower,
+                                      consts.INDEX_URL, guest_response)
+        self.assertEqual(revalidated.status_code, 200)
+        revalidated = self.revalidate(self.authorized_follower,
+                                      consts.INDEX_URL, response)
+        self.assertEqual(revalidated.status_code, 304)
@@ -0,0 +1,92 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import posts.tests.constants as consts
+from posts.models import Comment, Follow, Post, User, UserStats
+
+
+class CountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.follower = User.objects.create(username=consts.FOLLOWER)
+        cls.authorized_follower = Client()
+        cls.authorized_follower.force_login(cls.follower)
+
+    def stats(self, user):
+        return UserStats.objects.get(user=user)
+
+    def test_follow_counters(self):
+        self.authorized_follower.get(consts.PROFILE_FOLLOW_URL)
+        self.assertEqual(self.stats(self.user).followers_count, 1)
+        self.assertEqual(self.stats(self.follower).following_count, 1)
+        self.authorized_follower.get(consts.PROFILE_UNFOLLOW_URL)
+        self.assertEqual(self.stats(self.user).followers_count, 0)
+        self.assertEqual(self.stats(self.follower).following_count, 0)
+
+    def test_post_and_comment_counters(self):
+        post = Post.objects.create(text=consts.POST_TEXT, author=self.user)
+        self.authorized_follower.post(
+            reverse("add_comment", args=[self.user.username, post.id]),
+            {"text": consts.COMMENT_TEXT}
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 1)
+        self.assertEqual(self.stats(self.user).posts_count, 1)
+        Comment.objects.filter(post=post).delete()
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 0)
+        post.delete()
+        self.assertEqual(self.stats(self.user).posts_count, 0)
+
+    def test_cascade_delete(self):
+        author = User.objects.create(username=consts.USERNAME + "-author")
+        Follow.objects.create(user=self.follower, author=author)
+        post = Post.objects.create(text=consts.POST_TEXT, author=self.user)
+        Comment.objects.create(post=post, author=author,
+                               text=consts.COMMENT_TEXT)
+        author.delete()
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 0)
+        self.assertEqual(self.stats(self.follower).following_count, 0)
+
+    def test_post_delete_skips_comment_bookkeeping(self):
+        queries = []
+        for comments in (2, 20):
+            post = Post.objects.create(text=consts.POST_TEXT,
+                                       author=self.user)
+            Comment.objects.bulk_create(
+                Comment(post=post, author=self.follower,
+                        text=consts.COMMENT_TEXT)
+                for comment in range(comments)
+            )
+            with CaptureQueriesContext(connection) as captured:
+                post.delete()
+            queries.append(len(captured))
+        self.assertEqual(queries[0], queries[1])
+        self.assertFalse(Comment.objects.exists())
+        other = Post.objects.create(text=consts.POST_TEXT, author=self.user)
+        Comment.objects.create(post=other, author=self.follower,
+                               text=consts.COMMENT_TEXT)
+        Comment.objects.get().delete()
+        other.refresh_from_db()
+        self.assertEqual(other.comment_count, 0)
+
+    def test_recount_repairs_drift(self):
+        post = Post.objects.create(text=consts.POST_TEXT, author=self.user)
+        Follow.objects.create(user=self.follower, author=self.user)
+        Post.objects.update(comment_count=42)
+        UserStats.objects.update(followers_count=42, posts_count=42)
+        UserStats.objects.filter(user=self.follower).delete()
+        call_command("recount_stats", stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 0)
+        self.assertEqual(self.stats(self.user).followers_count, 1)
+        self.assertEqual(self.stats(self.user).posts_count, 1)
+        self.assertEqual(self.stats(self.follower).following_count, 1)
@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase
+
+from posts.db import check_connections
+
+
+class DatabaseConnectionTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.database = DatabaseWrapper({
+            **connection.settings_dict,
+            "NAME": os.path.join(self.directory, "test.sqlite3"),
+            "CONN_HEALTH_CHECKS": True,
+        }, alias="connection-test")
+
+    def tearDown(self):
+        self.database.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def pragma(self, name):
+        with self.database.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_sqlite_pragmas(self):
+        CHECK_PRAGMAS = {
+            "journal_mode": "wal",
+            "synchronous": 1,
+            "temp_store": 2,
+        }
+        for name, value in CHECK_PRAGMAS.items():
+            with self.subTest(pragma=name):
+                self.assertEqual(self.pragma(name), value)
+
+    def test_unusable_connection_is_closed(self):
+        self.database.ensure_connection()
+        databases = mock.Mock(all=mock.Mock(return_value=[self.database]))
+        with mock.patch("posts.db.connections", databases):
+            check_connections()
+            self.assertIsNotNone(self.database.connection)
+            with mock.patch.object(self.database, "is_usable",
+                                   return_value=False):
+                check_connections()
+        self.assertIsNone(self.database.connection)
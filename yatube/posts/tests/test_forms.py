@@ -59,6 +59,10 @@ class PostFormTests(TestCase):
         shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
         super().tearDownClass()
 
+    def setUp(self):
+        self.UPLOADED_FIRST_IMG.seek(0)
+        self.UPLOADED_SECOND_IMG.seek(0)
+
     def test_authorized_user_new_post(self):
         self.assertEqual(Post.objects.count(), 1)
         form_data = {
@@ -76,6 +80,7 @@ class PostFormTests(TestCase):
         self.assertEqual(post.text, consts.POST_NEW_TEXT)
         self.assertEqual(post.group.id, self.second_group.id)
         self.assertEqual(post.author, self.user)
+        self.assertTrue(post.image)
 
     def test_guest_new_post(self):
         cash_count = Post.objects.count()
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+import posts.tests.constants as consts
+from posts import graph
+from posts.models import Follow, User
+
+
+def run_immediately(callback):
+    callback()
+
+
+class FollowGraphTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.follower = User.objects.create(username=consts.FOLLOWER)
+        cls.others = [User.objects.create(username=f"{consts.USERNAME}-{n}")
+                      for n in range(3)]
+        Follow.objects.create(user=cls.follower, author=cls.user)
+        for other in cls.others:
+            Follow.objects.create(user=cls.follower, author=other)
+        Follow.objects.create(user=cls.others[0], author=cls.follower)
+        cls.authorized_follower = Client()
+        cls.authorized_follower.force_login(cls.follower)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_adjacency(self):
+        self.assertEqual(list(graph.following(self.follower.pk)),
+                         sorted([self.user.pk] +
+                                [other.pk for other in self.others]))
+        self.assertEqual(list(graph.followers(self.follower.pk)),
+                         [self.others[0].pk])
+        self.assertEqual(list(graph.mutual(self.follower.pk)),
+                         [self.others[0].pk])
+        self.assertTrue(graph.is_following(self.follower.pk, self.user.pk))
+        self.assertFalse(graph.is_following(self.user.pk, self.follower.pk))
+        self.assertEqual(list(graph.following(self.user.pk)), [])
+
+    def test_lookups_are_cached(self):
+        graph.is_following(self.follower.pk, self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(graph.is_following(self.follower.pk,
+                                               self.user.pk))
+            self.assertTrue(graph.is_following(self.follower.pk,
+                                               self.others[1].pk))
+
+    @mock.patch("posts.cache.transaction.on_commit", run_immediately)
+    def test_follow_and_unfollow_invalidate(self):
+        self.assertFalse(graph.is_following(self.user.pk, self.follower.pk))
+        self.assertEqual(list(graph.mutual(self.user.pk)), [])
+        Follow.objects.create(user=self.user, author=self.follower)
+        self.assertTrue(graph.is_following(self.user.pk, self.follower.pk))
+        self.assertEqual(list(graph.mutual(self.user.pk)),
+                         [self.follower.pk])
+        self.authorized_follower.get(consts.PROFILE_UNFOLLOW_URL)
+        self.assertFalse(graph.is_following(self.follower.pk, self.user.pk))
+        self.assertEqual(list(graph.followers(self.user.pk)), [])
+        self.authorized_follower.get(consts.PROFILE_FOLLOW_URL)
+        self.assertTrue(graph.is_following(self.follower.pk, self.user.pk))
+        self.assertEqual(Follow.objects.filter(
+            user=self.follower, author=self.user).count(), 1)
+
+    def test_intersect(self):
+        first = graph.unpack(graph.pack([9, 1, 5, 7]))
+        second = graph.unpack(graph.pack([2, 5, 9, 11, 13]))
+        self.assertEqual(list(first), [1, 5, 7, 9])
+        self.assertEqual(list(graph.intersect(first, second)), [5, 9])
+        self.assertEqual(list(graph.intersect(second, first)), [5, 9])
+
+    def test_evicted_version_is_not_reused(self):
+        self.assertEqual(list(graph.following(self.user.pk)), [])
+        Follow.objects.create(user=self.user, author=self.follower)
+        cache.delete(f"feed-version:user:{self.user.pk}")
+        self.assertTrue(graph.is_following(self.user.pk, self.follower.pk))
@@ -0,0 +1,131 @@
+import os
+import shutil
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase
+from PIL import Image
+
+import posts.tests.constants as consts
+from posts import thumbnails
+from posts.image_variants import build_variants, variant_files
+from posts.models import Post, User
+
+PLACEHOLDER = "img/thumbnail-placeholder.svg"
+
+
+def run_immediately(callback):
+    callback()
+
+
+class ThumbnailTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = os.path.join(settings.MEDIA_ROOT, "media")
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.authorized_user = Client()
+        cls.authorized_user.force_login(cls.user)
+        cls.guest = Client()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+
+    def uploaded_image(self):
+        return SimpleUploadedFile(
+            name=consts.FIRST_IMG_NAME,
+            content=consts.FIRST_IMG,
+            content_type="image/gif"
+        )
+
+    def jpeg_file(self, color):
+        buffer = BytesIO()
+        Image.new("RGB", (600, 400), color).save(buffer, "JPEG")
+        buffer.seek(0)
+        return buffer
+
+    def assertStored(self, variants, stored=True):
+        for name in variant_files(variants):
+            self.assertEqual(default_storage.exists(name), stored)
+
+    def test_placeholder_until_warmed(self):
+        post = Post.objects.create(text=consts.POST_TEXT, author=self.user,
+                                   image=self.uploaded_image())
+        self.assertContains(self.guest.get(consts.INDEX_URL), PLACEHOLDER)
+        call_command("warm_thumbnails", stdout=StringIO())
+        post.refresh_from_db()
+        fallback = default_storage.url(post.image_variants["fallback"])
+        response = self.guest.get(consts.INDEX_URL)
+        self.assertContains(response, fallback)
+        self.assertContains(response, 'type="image/webp"')
+        self.assertNotContains(response, PLACEHOLDER)
+
+    @mock.patch("posts.thumbnails.THUMBNAIL_QUEUE", "eager")
+    @mock.patch("posts.thumbnails.transaction.on_commit", run_immediately)
+    def test_new_post_schedules_thumbnail(self):
+        self.authorized_user.post(consts.NEW_POST_URL, {
+            "text": consts.POST_TEXT,
+            "image": self.uploaded_image()
+        })
+        post = Post.objects.get(author=self.user)
+        self.assertTrue(post.image_variants)
+
+    def test_variants_are_resized_and_stripped(self):
+        exif = Image.Exif()
+        exif[0x010F] = "test-camera"
+        original = BytesIO()
+        Image.new("RGB", (1200, 800), "red").save(original, "JPEG",
+                                                  exif=exif)
+        original.seek(0)
+        variants = build_variants(original)
+        jpeg = next(source for source in variants["sources"]
+                    if source["type"] == "image/jpeg")
+        self.assertEqual([width for name, width in jpeg["files"]],
+                         [480, 960])
+        self.assertEqual((variants["width"], variants["height"]), (960, 339))
+        with default_storage.open(variants["fallback"]) as variant_file:
+            with Image.open(variant_file) as variant:
+                self.assertEqual(variant.size, (960, 339))
+                self.assertFalse(variant.getexif())
+        again = build_variants(BytesIO(original.getvalue()))
+        self.assertEqual(again["fallback"], variants["fallback"])
+
+    def test_regeneration_deletes_replaced_variants(self):
+        post = Post.objects.create(text=consts.POST_TEXT, author=self.user,
+                                   image=self.uploaded_image())
+        stale = build_variants(self.jpeg_file("blue"))
+        Post.objects.filter(pk=post.pk).update(image_variants=stale)
+        variants = thumbnails.generate(post.pk)
+        self.assertStored(stale, False)
+        self.assertStored(variants)
+
+    @mock.patch("posts.thumbnails.THUMBNAIL_QUEUE", "eager")
+    @mock.patch("posts.thumbnails.transaction.on_commit", run_immediately)
+    def test_replaced_image_deletes_unshared_variants(self):
+        post = Post.objects.create(text=consts.POST_TEXT, author=self.user,
+                                   image=self.uploaded_image())
+        shared = Post.objects.create(text=consts.POST_TEXT, author=self.user,
+                                     image=self.uploaded_image())
+        variants = thumbnails.generate(post.pk)
+        self.assertEqual(thumbnails.generate(shared.pk), variants)
+        post.refresh_from_db()
+        self.assertEqual(post.image_variants_key, variants["fallback"])
+        post.image = SimpleUploadedFile(consts.SECOND_IMG_NAME,
+                                        self.jpeg_file("green").getvalue())
+        post.save()
+        self.assertStored(variants)
+        shared.refresh_from_db()
+        shared.image = SimpleUploadedFile(consts.SECOND_IMG_NAME,
+                                          self.jpeg_file("green").getvalue())
+        shared.save()
+        self.assertStored(variants, False)
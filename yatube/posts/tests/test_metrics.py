@@ -0,0 +1,86 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+import posts.tests.constants as consts
+from posts import metrics
+from posts.models import Post, User
+
+
+class RequestMetricsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        Post.objects.create(text=consts.POST_TEXT, author=cls.user)
+        cls.staff = User.objects.create(username=consts.FOLLOWER,
+                                        is_staff=True)
+        cls.guest = Client()
+        cls.staff_client = Client()
+        cls.staff_client.force_login(cls.staff)
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+
+    def server_timing(self, response):
+        return dict(
+            entry.split(";", 1) for entry in
+            response["Server-Timing"].split(", ")
+        )
+
+    def test_server_timing_is_off_by_default(self):
+        self.assertNotIn("Server-Timing", self.guest.get(consts.INDEX_URL))
+
+    @mock.patch("posts.middleware.SERVER_TIMING", True)
+    def test_server_timing_header(self):
+        timing = self.server_timing(self.guest.get(consts.INDEX_URL))
+        for name in ("total", "db", "tpl", "cache"):
+            with self.subTest(name=name):
+                self.assertIn(name, timing)
+        self.assertIn('desc="1 queries"', timing["db"])
+        self.assertIn('desc="0 hits', timing["cache"])
+        timing = self.server_timing(self.guest.get(consts.INDEX_URL))
+        self.assertIn('desc="0 queries"', timing["db"])
+        self.assertNotIn('desc="0 hits', timing["cache"])
+
+    @mock.patch("posts.middleware.SERVER_TIMING", True)
+    def test_query_budget(self):
+        with mock.patch("posts.metrics.QUERY_BUDGET", 0):
+            with self.assertLogs("posts.middleware", "WARNING"):
+                response = self.guest.get(consts.PROFILE_URL)
+        self.assertIn("budget", self.server_timing(response))
+        self.assertNotIn("budget",
+                         self.server_timing(self.guest.get(consts.INDEX_URL)))
+
+    @mock.patch("posts.views.METRICS_TOKEN", "metrics-token")
+    def test_metrics_endpoint(self):
+        self.guest.get(consts.INDEX_URL)
+        self.guest.get(consts.PROFILE_URL)
+        response = self.guest.get(consts.METRICS_URL,
+                                  HTTP_AUTHORIZATION="Bearer metrics-token")
+        self.assertEqual(response.status_code, 200)
+        text = response.content.decode()
+        CHECK_LINES = (
+            'yatube_requests_total{view="index",status="200"} 1',
+            'yatube_db_queries_total{view="index"} 1',
+            'yatube_request_duration_seconds_count{view="profile"} 1',
+            'yatube_request_duration_seconds_bucket{view="profile",'
+            'le="+Inf"} 1',
+            'yatube_cache_events_total{view="index",event="miss"} 3',
+            'yatube_cache_lookups_total{family="page",event="miss"} 2',
+        )
+        for line in CHECK_LINES:
+            with self.subTest(line=line):
+                self.assertIn(line, text)
+
+    def test_metrics_endpoint_hidden_from_guests(self):
+        response = self.guest.get(consts.METRICS_URL, REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(response.status_code, 404)
+        with mock.patch("posts.views.METRICS_TOKEN", "metrics-token"):
+            response = self.guest.get(consts.METRICS_URL,
+                                      HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 404)
+        response = self.staff_client.get(consts.METRICS_URL)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,139 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+import posts.tests.constants as consts
+from posts import async_views, middleware
+from posts.models import Comment, Group, Post, User
+
+
+def run_immediately(callback):
+    callback()
+
+
+class PageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.follower = User.objects.create(username=consts.FOLLOWER)
+        cls.group = Group.objects.create(
+            title=consts.FIRST_GROUP_NAME, slug=consts.FIRST_GROUP_SLUG,
+            description=consts.FIRST_GROUP_DESCRIPTION
+        )
+        cls.post = Post.objects.create(text=consts.POST_TEXT, author=cls.user,
+                                       group=cls.group)
+        cls.POST_URL = reverse("post", args=[consts.USERNAME, cls.post.id])
+        cls.guest = Client()
+        cls.authorized_user = Client()
+        cls.authorized_user.force_login(cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def assertCached(self, url):
+        with self.assertNumQueries(0):
+            response = self.guest.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context)
+        return response
+
+    def assertRendered(self, url):
+        response = self.guest.get(url)
+        self.assertIsNotNone(response.context)
+        return response
+
+    def test_anonymous_pages_are_cached(self):
+        CHECK_URLS = {
+            consts.INDEX_URL: "index",
+            consts.FIRST_GROUP_URL: f"group:{self.group.pk}",
+            consts.PROFILE_URL: f"user:{self.user.pk}",
+            self.POST_URL: f"profile:{self.user.pk}",
+            consts.AUTHOR_URL: "all",
+            consts.TECH_URL: "all",
+        }
+        for url, surrogate_key in CHECK_URLS.items():
+            with self.subTest(url=url):
+                rendered = self.assertRendered(url)
+                cached = self.assertCached(url)
+                self.assertEqual(cached.content, rendered.content)
+                self.assertIn(surrogate_key, cached["Surrogate-Key"].split())
+                self.assertIn("public", cached["Cache-Control"])
+                self.assertIn("max-age", cached["Surrogate-Control"])
+
+    def test_cached_page_revalidation(self):
+        response = self.assertRendered(consts.PROFILE_URL)
+        with self.assertNumQueries(0):
+            response = self.guest.get(consts.PROFILE_URL,
+                                      HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    @mock.patch("posts.cache.transaction.on_commit", run_immediately)
+    def test_targeted_invalidation(self):
+        for url in (consts.INDEX_URL, consts.PROFILE_URL, self.POST_URL,
+                    consts.FOLLOWER_URL, consts.FIRST_GROUP_URL):
+            self.assertRendered(url)
+        Post.objects.create(text=consts.POST_NEW_TEXT, author=self.follower)
+        self.assertCached(consts.PROFILE_URL)
+        self.assertCached(consts.FIRST_GROUP_URL)
+        self.assertRendered(consts.INDEX_URL)
+        self.assertRendered(consts.FOLLOWER_URL)
+        Comment.objects.create(post=self.post, author=self.follower,
+                               text=consts.COMMENT_TEXT)
+        self.assertContains(self.assertRendered(self.POST_URL),
+                            consts.COMMENT_TEXT)
+        self.assertCached(consts.FOLLOWER_URL)
+        self.group.title = consts.SECOND_GROUP_NAME
+        self.group.save()
+        self.assertContains(self.assertRendered(consts.FIRST_GROUP_URL),
+                            consts.SECOND_GROUP_NAME)
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.assertRendered(consts.INDEX_URL)
+        self.assertCached(consts.INDEX_URL)
+        response = self.authorized_user.get(consts.INDEX_URL)
+        self.assertIsNotNone(response.context)
+        self.assertNotIn("Surrogate-Key", response)
+        self.assertCached(consts.INDEX_URL)
+
+    @mock.patch("posts.async_views.ASYNC_PARALLEL_QUERIES", False)
+    def test_async_cache_io_runs_off_event_loop(self):
+        on_loop = []
+
+        def record(function):
+            def wrapper(*args):
+                try:
+                    asyncio.get_running_loop()
+                    on_loop.append(function.__name__)
+                except RuntimeError:
+                    pass
+                return function(*args)
+            return wrapper
+
+        views_called = []
+
+        async def get_response(request):
+            views_called.append(request)
+            return await async_views.index(request)
+
+        page_cache = middleware.PageCacheMiddleware(get_response)
+        for name in ("get_cached_response", "feed_versions",
+                     "cache_response"):
+            patcher = mock.patch(f"posts.middleware.{name}",
+                                 record(getattr(middleware, name)))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        responses = []
+        for _ in range(2):
+            request = RequestFactory().get(consts.INDEX_URL)
+            request.user = AnonymousUser()
+            responses.append(async_to_sync(page_cache)(request))
+        self.assertEqual(on_loop, [])
+        self.assertEqual(len(views_called), 1)
+        self.assertEqual(responses[1].content, responses[0].content)
+        self.assertIn("index", responses[1]["Surrogate-Key"].split())
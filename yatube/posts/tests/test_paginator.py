@@ -1,7 +1,10 @@
+from django.core.cache import cache
 from django.test import Client, TestCase
+from django.utils import timezone
 
 import posts.tests.constants as consts
-from posts.models import Post, User
+from posts.models import Group, Post, User
+from posts.paginator import LAST, NEXT, CursorPaginator, encode_cursor
 from posts.settings import POSTS_PER_PAGE
 
 
@@ -10,16 +13,93 @@ class PostFormTests(TestCase):
     def setUpClass(cls):
         super().setUpClass()
         cls.user = User.objects.create(username=consts.USERNAME)
+        Group.objects.create(title=consts.FIRST_GROUP_NAME,
+                             slug=consts.FIRST_GROUP_SLUG,
+                             description=consts.FIRST_GROUP_DESCRIPTION)
         cls.guest = Client()
         cls.authorized_user = Client()
         cls.authorized_user.force_login(cls.user)
         for post_item in range(2 * POSTS_PER_PAGE):
             Post.objects.create(text=consts.POST_TEXT, author=cls.user)
 
+    def setUp(self):
+        cache.clear()
+
     def test_paginator_first_page(self):
         response = self.guest.get(consts.INDEX_URL)
         self.assertEqual(len(response.context["page"]), POSTS_PER_PAGE)
 
     def test_paginator_second_page(self):
-        response = self.guest.get(consts.INDEX_URL + "?page=2")
+        first_page = self.guest.get(consts.INDEX_URL).context["page"]
+        response = self.guest.get(
+            consts.INDEX_URL + "?cursor=" + first_page.next_cursor)
         self.assertEqual(len(response.context["page"]), POSTS_PER_PAGE)
+        self.assertFalse(set(first_page) & set(response.context["page"]))
+
+    def test_pager_links(self):
+        first_page = self.guest.get(consts.INDEX_URL)
+        self.assertContains(first_page, f"?cursor={LAST}")
+        self.assertNotContains(first_page, "Первая")
+        last_page = self.guest.get(consts.INDEX_URL, {"cursor": LAST})
+        self.assertEqual(len(last_page.context["page"]), POSTS_PER_PAGE)
+        self.assertFalse(last_page.context["page"].has_next())
+        self.assertContains(last_page, f'href="{consts.INDEX_URL}"')
+        self.assertNotContains(last_page, f"?cursor={LAST}")
+
+    def test_paginator_invalid_cursor(self):
+        response = self.guest.get(consts.INDEX_URL + "?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context["page"].has_previous())
+
+    def test_paginator_cursor_of_other_type(self):
+        cursor = encode_cursor(NEXT, (1.5, 3))
+        for url in (consts.INDEX_URL, consts.PROFILE_URL,
+                    consts.FIRST_GROUP_URL, consts.API_INDEX_URL,
+                    consts.API_PROFILE_URL):
+            with self.subTest(url=url):
+                response = self.guest.get(url, {"cursor": cursor})
+                self.assertEqual(response.status_code, 200)
+        cache.clear()
+        response = self.guest.get(consts.INDEX_URL, {"cursor": cursor})
+        self.assertEqual(len(response.context["page"]), POSTS_PER_PAGE)
+        self.assertFalse(response.context["page"].has_previous())
+
+
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        Post.objects.bulk_create(
+            Post(text=consts.POST_TEXT, author=cls.user)
+            for post_item in range(2 * POSTS_PER_PAGE + 1)
+        )
+        Post.objects.update(pub_date=timezone.now())
+        cls.posts = list(Post.objects.order_by("-pub_date", "-pk"))
+
+    def test_walk_forward_and_back_with_equal_dates(self):
+        paginator = CursorPaginator(Post.objects.all(), POSTS_PER_PAGE)
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+        self.assertEqual([post for page in pages for post in page],
+                         self.posts)
+        previous = paginator.page(pages[-1].previous_cursor)
+        self.assertEqual(list(previous), list(pages[-2]))
+        self.assertTrue(previous.has_next())
+
+    def test_last_page(self):
+        paginator = CursorPaginator(Post.objects.all(), POSTS_PER_PAGE)
+        last = paginator.page(LAST)
+        self.assertEqual(list(last), self.posts[-POSTS_PER_PAGE:])
+        self.assertFalse(last.has_next())
+        previous = paginator.page(last.previous_cursor)
+        self.assertEqual(list(previous),
+                         self.posts[-2 * POSTS_PER_PAGE:-POSTS_PER_PAGE])
+
+    def test_approximate_total(self):
+        paginator = CursorPaginator(Post.objects.all(), POSTS_PER_PAGE)
+        self.assertIsNone(paginator.count)
+        paginator = CursorPaginator(Post.objects.all(), POSTS_PER_PAGE,
+                                    approximate_total=True)
+        self.assertEqual(paginator.count, len(self.posts))
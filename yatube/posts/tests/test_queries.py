@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+import posts.tests.constants as consts
+from posts.models import Comment, Follow, Group, Post, User
+from posts.settings import POSTS_PER_PAGE
+
+
+class FeedQueryCountTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.follower = User.objects.create(username=consts.FOLLOWER)
+        Follow.objects.create(author=cls.user, user=cls.follower)
+        cls.group = Group.objects.create(
+            title=consts.FIRST_GROUP_NAME,
+            slug=consts.FIRST_GROUP_SLUG,
+            description=consts.FIRST_GROUP_DESCRIPTION
+        )
+        for post_item in range(POSTS_PER_PAGE + 1):
+            post = Post.objects.create(text=consts.POST_TEXT,
+                                       author=cls.user, group=cls.group)
+            Comment.objects.create(post=post, author=cls.follower,
+                                   text=consts.COMMENT_TEXT)
+        cls.guest = Client()
+        cls.authorized_follower = Client()
+        cls.authorized_follower.force_login(cls.follower)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feed_query_count(self):
+        guest, follower = self.guest, self.authorized_follower
+        CHECK_QUERIES = {
+            "index_guest": (consts.INDEX_URL, guest, 1),
+            "group_guest": (consts.FIRST_GROUP_URL, guest, 2),
+            "profile_guest": (consts.PROFILE_URL, guest, 2),
+            "follow_index_follower": (consts.FOLLOW_INDEX_URL, follower, 3),
+        }
+        for name, (url, client, queries) in CHECK_QUERIES.items():
+            with self.subTest(url=url, msg=name):
+                with self.assertNumQueries(queries):
+                    response = client.get(url)
+                self.assertEqual(len(response.context["page"]),
+                                 POSTS_PER_PAGE)
+
+    def test_feed_comment_count(self):
+        post = self.guest.get(consts.INDEX_URL).context["page"][0]
+        self.assertEqual(post.comment_count, 1)
@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+import time
+import warnings
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client, RequestFactory, TestCase, override_settings
+
+import posts.tests.constants as consts
+from posts import routers
+from posts.models import Post, User
+from posts.settings import REPLICA_COOKIE, REPLICA_STICKY_SECONDS
+
+REPLICA = "replica_0"
+LOCAL_REPLICA = "local_replica"
+
+
+def run_immediately(callback):
+    callback()
+
+
+class ReplicaRouterTests(TestCase):
+    databases = "__all__"
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.authorized_user = Client()
+        cls.authorized_user.force_login(cls.user)
+        cls.factory = RequestFactory()
+        cls.router = routers.ReplicaRouter()
+
+    def route_read(self, cookies=None, reading=True):
+        request = self.factory.get(consts.INDEX_URL)
+        request.COOKIES.update(cookies or {})
+        token = routers.start(request)
+        try:
+            view = routers.read_replica(
+                lambda request: self.router.db_for_read(Post))
+            if reading:
+                return view(request)
+            return self.router.db_for_read(Post)
+        finally:
+            routers.stop(token)
+
+    @mock.patch("posts.routers.replica_aliases", return_value=[REPLICA])
+    def test_read_views_use_replica(self, aliases):
+        recent = str(time.time())
+        stale = str(time.time() - REPLICA_STICKY_SECONDS - 1)
+        CHECK_ROUTES = {
+            "read_view": ({}, True, REPLICA),
+            "other_view": ({}, False, None),
+            "recent_write": ({REPLICA_COOKIE: recent}, True, None),
+            "stale_write": ({REPLICA_COOKIE: stale}, True, REPLICA),
+            "broken_cookie": ({REPLICA_COOKIE: "broken"}, True, REPLICA),
+        }
+        for name, (cookies, reading, alias) in CHECK_ROUTES.items():
+            with self.subTest(name=name):
+                self.assertEqual(self.route_read(cookies, reading), alias)
+
+    @mock.patch("posts.routers.replica_aliases", return_value=[])
+    def test_reads_without_replicas_use_default(self, aliases):
+        self.assertIsNone(self.route_read())
+
+    def test_writes_set_sticky_cookie(self):
+        CHECK_WRITES = {
+            "new_post": (consts.NEW_POST_URL, {"text": consts.POST_TEXT}),
+            "follow": (consts.FOLLOWER_URL + "follow/", None),
+        }
+        User.objects.create(username=consts.FOLLOWER)
+        for name, (url, data) in CHECK_WRITES.items():
+            with self.subTest(name=name):
+                if data is None:
+                    response = self.authorized_user.get(url)
+                else:
+                    response = self.authorized_user.post(url, data)
+                self.assertIn(REPLICA_COOKIE, response.cookies)
+        response = Client().get(consts.INDEX_URL)
+        self.assertNotIn(REPLICA_COOKIE, response.cookies)
+
+
+class ReplicaDatabaseTests(TestCase):
+    databases = "__all__"
+
+    @classmethod
+    def setUpClass(cls):
+        cls.replica_dir = tempfile.mkdtemp()
+        replica = {
+            **connections["default"].settings_dict,
+            "NAME": os.path.join(cls.replica_dir, "replica.sqlite3"),
+        }
+        cls.replica_settings = override_settings(DATABASES={
+            **connections.databases, LOCAL_REPLICA: replica
+        })
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            cls.replica_settings.enable()
+        connections.databases[LOCAL_REPLICA] = replica
+        call_command("migrate", database=LOCAL_REPLICA, verbosity=0)
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        User.objects.using(LOCAL_REPLICA).create(pk=cls.user.pk,
+                                                 username=consts.USERNAME)
+        cls.authorized_user = Client()
+        cls.authorized_user.force_login(cls.user)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[LOCAL_REPLICA].close()
+        del connections[LOCAL_REPLICA]
+        del connections.databases[LOCAL_REPLICA]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            cls.replica_settings.disable()
+        shutil.rmtree(cls.replica_dir, ignore_errors=True)
+
+    def index_texts(self, client):
+        return [post.text for post in client.get(consts.INDEX_URL)
+                .context["page"]]
+
+    @mock.patch("posts.cache.transaction.on_commit", run_immediately)
+    @mock.patch("posts.routers.replica_aliases",
+                return_value=[LOCAL_REPLICA])
+    def test_reads_follow_writes(self, aliases):
+        Post.objects.using(LOCAL_REPLICA).create(text=consts.POST_NEW_TEXT,
+                                                 author=self.user)
+        response = self.authorized_user.post(consts.NEW_POST_URL,
+                                             {"text": consts.POST_TEXT})
+        self.assertIn(REPLICA_COOKIE, response.cookies)
+        self.assertEqual(self.index_texts(Client()), [consts.POST_TEXT])
+        cache.clear()
+        self.assertEqual(self.index_texts(self.authorized_user),
+                         [consts.POST_TEXT])
+        cache.clear()
+        self.assertEqual(self.index_texts(Client()), [consts.POST_NEW_TEXT])
@@ -0,0 +1,92 @@
+from django.contrib.admin.sites import site
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+import posts.tests.constants as consts
+from posts.models import Group, Post, User
+from posts.paginator import NEXT, encode_cursor
+from posts.settings import POSTS_PER_PAGE
+from posts.stemmer import stem
+
+SEARCH_URL = reverse("search")
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.group = Group.objects.create(
+            title="Путешествия по горам",
+            slug=consts.FIRST_GROUP_SLUG,
+            description=consts.FIRST_GROUP_DESCRIPTION
+        )
+        cls.guest = Client()
+
+    def search(self, query, cursor=None):
+        params = {"q": query}
+        if cursor:
+            params["cursor"] = cursor
+        return self.guest.get(SEARCH_URL, params).context["page"]
+
+    def test_stemmer(self):
+        CHECK_STEMS = {
+            "красивая": "красив",
+            "важнейшие": "важн",
+            "голосами": "голос",
+            "подумавши": "подума",
+        }
+        for word, expected in CHECK_STEMS.items():
+            with self.subTest(word=word):
+                self.assertEqual(stem(word), expected)
+
+    def test_russian_word_forms_match(self):
+        post = Post.objects.create(text="Мы видели красивые горы",
+                                   author=self.user)
+        Post.objects.create(text="Совсем другой текст", author=self.user)
+        self.assertEqual(list(self.search("красивая гора")), [post])
+
+    def test_index_follows_edits_and_deletes(self):
+        post = Post.objects.create(text="старый текст", author=self.user)
+        post.text = "новый текст"
+        post.save()
+        self.assertEqual(list(self.search("старый")), [])
+        self.assertEqual(list(self.search("новые")), [post])
+        post.delete()
+        self.assertEqual(list(self.search("новые")), [])
+
+    def test_group_title_is_indexed_and_ranked_lower(self):
+        in_group = Post.objects.create(text="заметка", author=self.user,
+                                       group=self.group)
+        in_text = Post.objects.create(text="путешествие", author=self.user)
+        self.assertEqual(list(self.search("путешествия")),
+                         [in_text, in_group])
+        self.group.title = "Другое"
+        self.group.save()
+        self.assertEqual(list(self.search("путешествия")), [in_text])
+
+    def test_results_paginate_with_cursor(self):
+        for post_item in range(POSTS_PER_PAGE + 1):
+            Post.objects.create(text="одинаковый текст", author=self.user)
+        first_page = self.search("текст")
+        second_page = self.search("текст", first_page.next_cursor)
+        self.assertEqual(len(first_page), POSTS_PER_PAGE)
+        self.assertEqual(len(second_page), 1)
+        self.assertFalse(set(first_page) & set(second_page))
+
+    def test_cursor_of_other_type(self):
+        post = Post.objects.create(text="текст", author=self.user)
+        cursor = encode_cursor(NEXT, (timezone.now(), post.pk))
+        response = self.guest.get(SEARCH_URL, {"q": "текст",
+                                               "cursor": cursor})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["page"]), [post])
+
+    def test_admin_uses_index(self):
+        post = Post.objects.create(text="красивые горы", author=self.user)
+        Post.objects.create(text="другое", author=self.user)
+        request = RequestFactory().get("/")
+        queryset, duplicates = site._registry[Post].get_search_results(
+            request, Post.objects.all(), "красивый")
+        self.assertEqual(list(queryset), [post])
@@ -0,0 +1,128 @@
+import os
+import random
+import shutil
+import statistics
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase
+
+from posts.benchmark import (compare, percentile, run, run_api,
+                             run_follow_graph, run_search, run_templates)
+from posts.models import Comment, Follow, Group, Post, User, UserStats
+from posts.search import search_posts
+from posts.seeding import WORDS, seed
+
+USERS = 40
+GROUPS = 3
+POSTS = 80
+COMMENTS = 60
+
+
+def run_immediately(callback):
+    callback()
+
+
+class SeedingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = os.path.join(settings.MEDIA_ROOT, "media")
+        with mock.patch("posts.cache.transaction.on_commit",
+                        run_immediately):
+            cls.prefix = seed(users=USERS, groups=GROUPS, posts=POSTS,
+                              comments=COMMENTS, image_share=0.5,
+                              rng=random.Random(1))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_seed_volumes(self):
+        CHECK_COUNTS = {
+            User: USERS,
+            Group: GROUPS,
+            Post: POSTS,
+            Comment: COMMENTS,
+        }
+        for model, count in CHECK_COUNTS.items():
+            with self.subTest(model=model.__name__):
+                self.assertEqual(model.objects.count(), count)
+        self.assertTrue(Post.objects.exclude(image="").exists())
+        self.assertTrue(Post.objects.filter(image="").exists())
+
+    def test_seed_counters(self):
+        stats = UserStats.objects.order_by("-followers_count")
+        self.assertEqual(stats.count(), USERS)
+        top = stats.first()
+        self.assertEqual(top.followers_count,
+                         Follow.objects.filter(author=top.user).count())
+        self.assertEqual(sum(Post.objects.values_list(
+            "comment_count", flat=True)), COMMENTS)
+
+    def test_seed_follow_graph_is_skewed(self):
+        followers = list(UserStats.objects.values_list(
+            "followers_count", flat=True))
+        self.assertGreater(max(followers), 3 * statistics.median(followers))
+
+    def test_seed_posts_are_searchable(self):
+        self.assertTrue(search_posts(WORDS[0]).exists())
+
+    def test_bench_run(self):
+        results = run(repeat=2, warmup=0)
+        self.assertEqual(
+            set(results["results"]),
+            {"index", "index_deep", "group_posts", "profile", "post_view",
+             "follow_index"}
+        )
+        for name, result in results["results"].items():
+            with self.subTest(case=name):
+                self.assertEqual(result["status"], [200])
+                self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        self.assertEqual(results["rows"]["Post"], POSTS)
+        changes = compare(results, results)
+        self.assertEqual(changes["index"]["ratio"], 1.0)
+
+    def test_bench_templates(self):
+        results = run_templates(sizes=(10, 50), repeat=2, warmup=0)
+        self.assertEqual(set(results["results"]),
+                         {"cached_10", "cached_50", "uncached_10",
+                          "uncached_50"})
+        self.assertEqual(results["results"]["cached_50"]["posts"], 50)
+
+    def test_bench_api(self):
+        results = run_api(repeat=2, warmup=0, only=("index", "post_view"))
+        self.assertEqual(set(results["results"]),
+                         {"index_html", "index_api", "post_view_html",
+                          "post_view_api"})
+        for name, result in results["results"].items():
+            with self.subTest(case=name):
+                self.assertEqual(result["status"], [200])
+                self.assertLess(result["gzip_bytes"], result["bytes"])
+        self.assertLess(results["results"]["index_api"]["bytes"],
+                        results["results"]["index_html"]["bytes"])
+
+    def test_bench_search(self):
+        results = run_search(sizes=(15, 30), repeat=1)
+        self.assertEqual(set(results["results"]),
+                         {"matches_15", "matches_30"})
+        self.assertEqual(results["results"]["matches_30"]["page"], 10)
+        self.assertEqual(results["rows"]["Post"], POSTS)
+
+    def test_bench_follow_graph(self):
+        results = run_follow_graph(users=200, edges=2000, lookups=100)
+        self.assertEqual(results["edges"], 2000)
+        self.assertEqual(results["array_bytes"], 2 * 2000 * 4)
+        self.assertGreater(results["followers_max"],
+                           3 * results["followers_median"])
+        self.assertIn("is_following_db", results["results"])
+        self.assertIn("is_following_graph", results["results"])
+
+
+class PercentileTests(TestCase):
+    def test_percentile(self):
+        samples = [4, 1, 3, 2, 5]
+        self.assertEqual(percentile(samples, 50), 3)
+        self.assertEqual(percentile(samples, 100), 5)
+        self.assertAlmostEqual(percentile(samples, 90), 4.6)
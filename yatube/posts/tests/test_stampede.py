@@ -0,0 +1,72 @@
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from posts import metrics
+from posts.cache import get_or_recompute
+
+FAMILY = "test_family"
+KEY = "test-stampede-key"
+
+
+class StampedeTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.settings_override = override_settings(CACHES={
+            "default": {
+                "BACKEND":
+                    "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": cls.cache_dir,
+            }
+        })
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.cache_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_miss_then_hit(self):
+        compute = mock.Mock(return_value="value")
+        metrics.reset()
+        for attempt in range(2):
+            self.assertEqual(
+                get_or_recompute(KEY, compute, 60, FAMILY), "value")
+        compute.assert_called_once()
+        text = metrics.render()
+        for event in ("miss", "hit"):
+            with self.subTest(event=event):
+                self.assertIn("yatube_cache_lookups_total"
+                              f'{{family="{FAMILY}",event="{event}"}} 1',
+                              text)
+
+    def test_early_recompute_near_expiry(self):
+        cache.set(KEY, ("old", 60.0, time.time() + 1), 60)
+        with mock.patch("posts.cache.random.random", return_value=0.99):
+            value = get_or_recompute(KEY, lambda: "new", 60, FAMILY)
+        self.assertEqual(value, "new")
+
+    def test_locked_key_serves_stale_value(self):
+        cache.set(KEY, ("old", 60.0, time.time() + 1), 60)
+        cache.add(f"{KEY}:lock", 1)
+        compute = mock.Mock(return_value="new")
+        with mock.patch("posts.cache.random.random", return_value=0.99):
+            value = get_or_recompute(KEY, compute, 60, FAMILY)
+        self.assertEqual(value, "old")
+        compute.assert_not_called()
+
+    @mock.patch("posts.cache.STAMPEDE_LOCK_WAIT", 0.1)
+    def test_locked_missing_key_computes_after_wait(self):
+        cache.add(f"{KEY}:lock", 1)
+        self.assertEqual(get_or_recompute(KEY, lambda: "new", 60, FAMILY),
+                         "new")
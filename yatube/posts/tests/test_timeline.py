@@ -0,0 +1,105 @@
+from unittest import mock
+
+from django.test import Client, TestCase
+
+import posts.tests.constants as consts
+from posts.models import Follow, Post, TimelineEntry, User
+from posts.seeding import seed
+from posts.settings import POSTS_PER_PAGE
+from posts.timeline import follow_paginator
+
+
+@mock.patch("posts.timeline.FOLLOW_FEED_MATERIALIZED", True)
+class TimelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.follower = User.objects.create(username=consts.FOLLOWER)
+        cls.authorized_follower = Client()
+        cls.authorized_follower.force_login(cls.follower)
+
+    def feed(self):
+        response = self.authorized_follower.get(consts.FOLLOW_INDEX_URL)
+        return list(response.context["page"])
+
+    def test_follow_backfills_and_unfollow_prunes(self):
+        post = Post.objects.create(text=consts.POST_TEXT, author=self.user)
+        self.authorized_follower.get(consts.PROFILE_FOLLOW_URL)
+        self.assertTrue(TimelineEntry.objects.filter(
+            user=self.follower, post=post).exists())
+        self.assertEqual(self.feed(), [post])
+        self.authorized_follower.get(consts.PROFILE_UNFOLLOW_URL)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.feed(), [])
+
+    def test_new_post_fans_out(self):
+        Follow.objects.create(user=self.follower, author=self.user)
+        self.client.force_login(self.user)
+        self.client.post(consts.NEW_POST_URL, {"text": consts.POST_TEXT})
+        post = Post.objects.get(author=self.user)
+        self.assertEqual(
+            TimelineEntry.objects.get(user=self.follower).pub_date,
+            post.pub_date
+        )
+        self.assertEqual(self.feed(), [post])
+
+    @mock.patch("posts.timeline.FANOUT_FOLLOWER_LIMIT", 1)
+    def test_popular_author_is_pulled(self):
+        Follow.objects.create(user=self.follower, author=self.user)
+        post = Post.objects.create(text=consts.POST_TEXT, author=self.user)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.feed(), [post])
+
+    @mock.patch("posts.timeline.FANOUT_FOLLOWER_LIMIT", 2)
+    def test_author_crossing_limit(self):
+        other = User.objects.create(username=consts.USERNAME + "-other")
+        Follow.objects.create(user=self.follower, author=self.user)
+        Follow.objects.create(user=other, author=self.user)
+        post = Post.objects.create(text=consts.POST_TEXT, author=self.user)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.feed(), [post])
+        Follow.objects.get(user=other).delete()
+        self.assertTrue(TimelineEntry.objects.filter(
+            user=self.follower, post=post).exists())
+        self.assertEqual(self.feed(), [post])
+        Follow.objects.create(user=other, author=self.user)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.feed(), [post])
+
+    def test_seed_keeps_existing_timelines(self):
+        post = Post.objects.create(text=consts.POST_TEXT, author=self.user)
+        Follow.objects.create(user=self.follower, author=self.user)
+        entry = TimelineEntry.objects.get(user=self.follower, post=post)
+        prefix = seed(users=10, groups=1, posts=30, comments=0,
+                      image_share=0)
+        self.assertTrue(TimelineEntry.objects.filter(pk=entry.pk).exists())
+        self.assertTrue(TimelineEntry.objects.filter(
+            user__username__startswith=prefix).exists())
+
+    @mock.patch("posts.timeline.FANOUT_FOLLOWER_LIMIT", 2)
+    def test_feed_pages_merge_timeline_and_pulled_authors(self):
+        other = User.objects.create(username=consts.USERNAME + "-other")
+        popular = User.objects.create(username=consts.USERNAME + "-popular")
+        Follow.objects.create(user=self.follower, author=self.user)
+        Follow.objects.create(user=self.follower, author=popular)
+        Follow.objects.create(user=other, author=popular)
+        for number in range(2 * POSTS_PER_PAGE + 1):
+            Post.objects.create(text=consts.POST_TEXT,
+                                author=(self.user, popular)[number % 2])
+        Post.objects.create(text=consts.POST_TEXT, author=other)
+        expected = list(Post.objects.exclude(author=other).order_by(
+            "-pub_date", "-pk"))
+        paginator = follow_paginator(self.follower, Post.objects.for_feed(),
+                                     POSTS_PER_PAGE)
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+        self.assertEqual([post for page in pages for post in page], expected)
+        previous = paginator.page(pages[-1].previous_cursor)
+        self.assertEqual(list(previous), list(pages[-2]))
+        self.assertFalse(TimelineEntry.objects.filter(
+            post__author=popular).exists())
+        response = self.authorized_follower.get(consts.API_FOLLOW_INDEX_URL)
+        self.assertEqual([post["id"] for post in response.json()["results"]],
+                         [post.pk for post in expected[:POSTS_PER_PAGE]])
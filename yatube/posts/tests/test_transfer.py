@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+import posts.tests.constants as consts
+from posts.models import (Comment, Follow, Group, ImportedRecord, Post,
+                          TimelineEntry, User, UserStats)
+from posts.search import search_posts
+from posts.transfer import export_dump, import_dump, write_checkpoint
+
+POSTS = 5
+
+
+class TransferTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.directory, "dump.checkpoint")
+        user = User.objects.create(username=consts.USERNAME)
+        follower = User.objects.create(username=consts.FOLLOWER)
+        group = Group.objects.create(
+            title=consts.FIRST_GROUP_NAME, slug=consts.FIRST_GROUP_SLUG,
+            description=consts.FIRST_GROUP_DESCRIPTION
+        )
+        for number in range(POSTS):
+            Post.objects.create(text=f"{consts.POST_TEXT}-{number}",
+                                author=user, group=group)
+        Comment.objects.create(post=Post.objects.first(), author=follower,
+                               text=consts.COMMENT_TEXT)
+        Follow.objects.create(user=follower, author=user)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def snapshot(self):
+        return {
+            "posts": list(Post.objects.order_by("text").values_list(
+                "text", "pub_date", "author__username", "group__slug",
+                "comment_count")),
+            "comments": list(Comment.objects.values_list(
+                "post__text", "author__username", "text", "created")),
+            "follows": list(Follow.objects.values_list(
+                "user__username", "author__username")),
+        }
+
+    def dump(self):
+        stream = StringIO()
+        export_dump(stream)
+        stream.seek(0)
+        return stream
+
+    def clear(self):
+        for model in (Follow, Comment, Post, Group, User):
+            model.objects.all().delete()
+
+    def test_export_import_round_trip(self):
+        expected = self.snapshot()
+        dump = self.dump()
+        self.clear()
+        self.assertEqual(import_dump(dump, self.checkpoint), (0, 10))
+        self.assertEqual(self.snapshot(), expected)
+        self.assertEqual(UserStats.objects.get(
+            user__username=consts.USERNAME).posts_count, POSTS)
+        self.assertTrue(search_posts(consts.POST_TEXT).exists())
+        self.assertFalse(User.objects.first().has_usable_password())
+        self.assertFalse(os.path.exists(self.checkpoint))
+        self.assertFalse(ImportedRecord.objects.exists())
+
+    def test_import_into_non_empty_database(self):
+        expected = self.snapshot()
+        records = [json.loads(line) for line in self.dump()]
+        self.clear()
+        other = User.objects.create(username=consts.USERNAME + "-other")
+        local = Post.objects.create(text=consts.POST_NEW_TEXT, author=other)
+        commented = next(record["post"] for record in records
+                         if record["model"] == "comment")
+        for record in records:
+            if record["model"] == "post" and record["id"] == commented:
+                record["id"] = local.pk
+            if record["model"] == "comment":
+                record["post"] = local.pk
+        dump = StringIO("".join(json.dumps(record) + "\n"
+                                for record in records))
+        self.assertEqual(import_dump(dump, self.checkpoint), (0, 10))
+        local.refresh_from_db()
+        self.assertEqual(local.text, consts.POST_NEW_TEXT)
+        self.assertEqual(local.comment_count, 0)
+        local.delete()
+        other.delete()
+        self.assertEqual(self.snapshot(), expected)
+
+    def test_resume_after_uncheckpointed_batch(self):
+        expected = self.snapshot()
+        dump = self.dump()
+        self.clear()
+        calls = []
+
+        def crash_after_posts(path, line):
+            calls.append(line)
+            if len(calls) == 3:
+                raise OSError
+            write_checkpoint(path, line)
+
+        with mock.patch("posts.transfer.write_checkpoint",
+                        side_effect=crash_after_posts):
+            with self.assertRaises(OSError):
+                import_dump(dump, self.checkpoint)
+        self.assertEqual(Post.objects.count(), POSTS)
+        dump.seek(0)
+        self.assertEqual(import_dump(dump, self.checkpoint), (3, 2))
+        self.assertEqual(self.snapshot(), expected)
+
+    def test_import_resumes_from_checkpoint(self):
+        dump = self.dump()
+        lines = dump.getvalue().splitlines()
+        self.clear()
+        users = [json.loads(line)["username"] for line in lines[:2]]
+        User.objects.create(username=users[0])
+        write_checkpoint(self.checkpoint, 2)
+        self.assertEqual(import_dump(dump, self.checkpoint, batch_size=2),
+                         (2, 6))
+        self.assertFalse(User.objects.filter(username=users[1]).exists())
+        self.assertEqual(Post.objects.count(), POSTS)
+
+    def test_commands_with_gzip(self):
+        expected = self.snapshot()
+        path = os.path.join(self.directory, "dump.jsonl.gz")
+        call_command("export_data", path, stdout=StringIO())
+        self.clear()
+        output = StringIO()
+        call_command("import_data", path, stdout=output)
+        self.assertIn("Imported records: 10.", output.getvalue())
+        self.assertEqual(self.snapshot(), expected)
+
+    @mock.patch("posts.timeline.FOLLOW_FEED_MATERIALIZED", True)
+    def test_import_keeps_existing_timelines(self):
+        dump = self.dump()
+        self.clear()
+        reader = User.objects.create(username=consts.USERNAME + "-reader")
+        writer = User.objects.create(username=consts.USERNAME + "-writer")
+        Follow.objects.create(user=reader, author=writer)
+        Post.objects.create(text=consts.POST_NEW_TEXT, author=writer)
+        entry = TimelineEntry.objects.get(user=reader)
+        import_dump(dump, self.checkpoint)
+        self.assertTrue(TimelineEntry.objects.filter(pk=entry.pk).exists())
+        self.assertEqual(TimelineEntry.objects.filter(
+            user__username=consts.FOLLOWER).count(), POSTS)
@@ -0,0 +1,81 @@
+import os
+import shutil
+from io import BytesIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase
+from django.urls import reverse
+from PIL import Image
+
+import posts.tests.constants as consts
+from posts.models import Post, User
+
+
+class UploadLimitTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings.MEDIA_ROOT = os.path.join(settings.MEDIA_ROOT, "media")
+        cls.user = User.objects.create(username=consts.USERNAME)
+        cls.authorized_user = Client()
+        cls.authorized_user.force_login(cls.user)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def post_image(self, content):
+        return self.authorized_user.post(consts.NEW_POST_URL, {
+            "text": consts.POST_TEXT,
+            "image": SimpleUploadedFile(name=consts.FIRST_IMG_NAME,
+                                        content=content,
+                                        content_type="image/gif")
+        })
+
+    @mock.patch("posts.uploads.MAX_UPLOAD_SIZE", 10)
+    def test_oversized_upload_is_a_form_error(self):
+        response = self.post_image(consts.FIRST_IMG)
+        self.assertFormError(response, "form", "image",
+                             "Файл слишком большой: не более 0 МБ.")
+        self.assertFalse(Post.objects.exists())
+
+    @mock.patch("posts.uploads.MAX_IMAGE_PIXELS", 100)
+    def test_too_many_pixels_is_a_form_error(self):
+        content = BytesIO()
+        Image.new("RGB", (20, 20)).save(content, "GIF")
+        response = self.post_image(content.getvalue())
+        self.assertFormError(
+            response, "form", "image",
+            "Изображение слишком большое: не более 100 пикселей."
+        )
+        self.assertFalse(Post.objects.exists())
+
+    def test_small_image_is_accepted(self):
+        response = self.post_image(consts.FIRST_IMG)
+        self.assertRedirects(response, consts.INDEX_URL)
+        self.assertTrue(Post.objects.get().image)
+
+    def test_new_post_checks_csrf(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        response = client.post(consts.NEW_POST_URL, {"text": consts.POST_TEXT})
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Post.objects.exists())
+
+    @mock.patch("posts.uploads.MAX_UPLOAD_SIZE", 10)
+    def test_admin_upload_is_not_limited(self):
+        admin = User.objects.create(username=consts.FOLLOWER, is_staff=True,
+                                    is_superuser=True)
+        self.client.force_login(admin)
+        response = self.client.post(reverse("admin:posts_post_add"), {
+            "text": consts.POST_TEXT,
+            "author": self.user.pk,
+            "image": SimpleUploadedFile(name=consts.FIRST_IMG_NAME,
+                                        content=consts.FIRST_IMG,
+                                        content_type="image/gif")
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Post.objects.get().image)
@@ -75,16 +75,22 @@ class PostFormTests(TestCase):
                     post = context["page"][0]
                 self.assertTrue(self.post == post)
 
+    def test_post_edit_link_only_for_author(self):
+        self.assertContains(self.authorized_user.get(self.POST_URL),
+                            self.POST_EDIT_URL)
+        self.assertNotContains(self.authorized_follower.get(self.POST_URL),
+                               self.POST_EDIT_URL)
+
     def test_post_on_another_group(self):
         context = self.authorized_user.get(consts.SECOND_GROUP_URL).context
         self.assertNotIn(self.post, context["page"])
 
     def test_cache_index_page(self):
         response_before = self.authorized_user.get(consts.INDEX_URL)
-        self.post.text = consts.POST_NEW_TEXT
-        self.post.save()
-        response_before = self.authorized_user.get(consts.INDEX_URL)
-        self.assertEqual(response_before.content, response_before.content)
+        Post.objects.filter(pk=self.post.pk).update(
+            text=consts.POST_NEW_TEXT)
+        response_cached = self.authorized_user.get(consts.INDEX_URL)
+        self.assertEqual(response_before.content, response_cached.content)
         cache.clear()
         response_after = self.authorized_user.get(consts.INDEX_URL)
         self.assertNotEqual(response_before.content, response_after.content)
@@ -0,0 +1,81 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+
+from posts.cache import bump_feed_version, post_scopes
+from posts.image_variants import (build_variants, delete_variants,
+                                  variants_key)
+from posts.models import Post
+from posts.settings import THUMBNAIL_QUEUE, THUMBNAIL_WORKERS
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def generate(post_id):
+    post = Post.objects.filter(pk=post_id).values(
+        "image", "image_variants", "author_id", "group_id"
+    ).first()
+    if post is None or not post["image"]:
+        return None
+    with default_storage.open(post["image"]) as image_file:
+        variants = build_variants(image_file)
+    updated = Post.objects.filter(pk=post_id, image=post["image"]).update(
+        image_variants=variants, image_variants_key=variants_key(variants)
+    )
+    if not updated:
+        delete_variants(variants)
+        return None
+    delete_variants(post["image_variants"], keep=variants)
+    bump_feed_version(*post_scopes(post["author_id"], post["group_id"]))
+    return variants
+
+
+def run_job(job, *args):
+    try:
+        job(*args)
+    except Exception:
+        logger.exception("Image job %s failed for %s", job.__name__, args)
+
+
+def run_worker_job(job, *args):
+    close_old_connections()
+    try:
+        run_job(job, *args)
+    finally:
+        close_old_connections()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=THUMBNAIL_WORKERS,
+                thread_name_prefix="thumbnails"
+            )
+        return _executor
+
+
+def submit(job, *args):
+    if THUMBNAIL_QUEUE == "eager":
+        run_job(job, *args)
+    else:
+        get_executor().submit(run_worker_job, job, *args)
+
+
+def enqueue(post_id):
+    submit(generate, post_id)
+
+
+def schedule(post_id):
+    transaction.on_commit(lambda: enqueue(post_id))
+
+
+def schedule_cleanup(variants):
+    transaction.on_commit(lambda: submit(delete_variants, variants))
@@ -0,0 +1,158 @@
+from collections import defaultdict
+
+from django.db.models import Q
+
+from posts.models import Follow, Post, TimelineEntry, UserStats
+from posts.paginator import CursorPaginator, approximate_count, keyset
+from posts.settings import (FANOUT_FOLLOWER_LIMIT, FOLLOW_FEED_MATERIALIZED,
+                            TIMELINE_BATCH_SIZE)
+
+
+def pulled_authors(user):
+    return Follow.objects.filter(
+        user=user, author__stats__followers_count__gte=FANOUT_FOLLOWER_LIMIT
+    ).values("author")
+
+
+def is_pulled(author_id):
+    return UserStats.objects.filter(
+        user_id=author_id, followers_count__gte=FANOUT_FOLLOWER_LIMIT
+    ).exists()
+
+
+def fan_out(post):
+    fan_out_posts(post.author_id, [post])
+
+
+def fan_out_posts(author_id, posts):
+    if not FOLLOW_FEED_MATERIALIZED or not posts or is_pulled(author_id):
+        return
+    followers = Follow.objects.filter(
+        author_id=author_id
+    ).values_list("user_id", flat=True)
+    TimelineEntry.objects.bulk_create(
+        (TimelineEntry(user_id=user_id, post=post, pub_date=post.pub_date)
+         for user_id in followers.iterator() for post in posts),
+        batch_size=TIMELINE_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def backfill(user_id, author_id):
+    if not FOLLOW_FEED_MATERIALIZED or is_pulled(author_id):
+        return
+    posts = Post.objects.filter(author_id=author_id).order_by()
+    TimelineEntry.objects.bulk_create(
+        (TimelineEntry(user_id=user_id, post_id=post_id, pub_date=pub_date)
+         for post_id, pub_date in
+         posts.values_list("pk", "pub_date").iterator()),
+        batch_size=TIMELINE_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def backfill_follows(follows):
+    if not FOLLOW_FEED_MATERIALIZED:
+        return
+    followers = defaultdict(list)
+    for user_id, author_id in follows:
+        followers[author_id].append(user_id)
+    for author_id, user_ids in followers.items():
+        if is_pulled(author_id):
+            continue
+        posts = list(Post.objects.filter(author_id=author_id).order_by(
+        ).values_list("pk", "pub_date"))
+        TimelineEntry.objects.bulk_create(
+            (TimelineEntry(user_id=user_id, post_id=post_id,
+                           pub_date=pub_date)
+             for user_id in user_ids for post_id, pub_date in posts),
+            batch_size=TIMELINE_BATCH_SIZE,
+            ignore_conflicts=True
+        )
+
+
+def backfill_followers(author_id):
+    backfill_follows(Follow.objects.filter(
+        author_id=author_id
+    ).values_list("user_id", "author_id"))
+
+
+def followers_changed(author_id, delta):
+    if not FOLLOW_FEED_MATERIALIZED:
+        return
+    followers = UserStats.objects.filter(user_id=author_id).values_list(
+        "followers_count", flat=True).first()
+    if delta > 0 and followers == FANOUT_FOLLOWER_LIMIT:
+        TimelineEntry.objects.filter(post__author_id=author_id).delete()
+    elif delta < 0 and followers == FANOUT_FOLLOWER_LIMIT - 1:
+        backfill_followers(author_id)
+
+
+def prune_pulled():
+    if not FOLLOW_FEED_MATERIALIZED:
+        return
+    TimelineEntry.objects.filter(
+        post__author__stats__followers_count__gte=FANOUT_FOLLOWER_LIMIT
+    ).delete()
+
+
+def prune(user_id, author_id):
+    TimelineEntry.objects.filter(
+        user_id=user_id, post__author_id=author_id
+    ).delete()
+
+
+def rebuild():
+    TimelineEntry.objects.all().delete()
+    if not FOLLOW_FEED_MATERIALIZED:
+        return
+    follows = Follow.objects.values_list("user_id", "author_id")
+    for user_id, author_id in follows.iterator():
+        backfill(user_id, author_id)
+
+
+def follow_feed(user, posts=None):
+    if posts is None:
+        posts = Post.objects.for_feed()
+    if not FOLLOW_FEED_MATERIALIZED:
+        return posts.filter(author__following__user=user)
+    materialized = TimelineEntry.objects.filter(user=user).values("post")
+    return posts.filter(
+        Q(pk__in=materialized) | Q(author__in=pulled_authors(user))
+    )
+
+
+class TimelinePaginator(CursorPaginator):
+    def __init__(self, object_list, per_page, user, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.user = user
+
+    def fetch(self, descending, position=None):
+        limit = self.per_page + 1
+        positions = list(keyset(
+            TimelineEntry.objects.filter(user=self.user), "pub_date",
+            descending, position, pk="post_id"
+        ).values_list("pub_date", "post_id")[:limit])
+        for author_id in pulled_authors(self.user).values_list(
+                "author", flat=True):
+            positions.extend(keyset(
+                Post.objects.filter(author_id=author_id), "pub_date",
+                descending, position
+            ).values_list("pub_date", "pk")[:limit])
+        positions.sort(reverse=descending)
+        ids = [pk for pub_date, pk in positions[:limit]]
+        posts = {self.position(post)[1]: post
+                 for post in self.object_list.filter(pk__in=ids)}
+        return [posts[pk] for pk in ids if pk in posts]
+
+    @property
+    def count(self):
+        if not self.approximate_total:
+            return None
+        return approximate_count(follow_feed(self.user))
+
+
+def follow_paginator(user, posts, per_page, **kwargs):
+    if not FOLLOW_FEED_MATERIALIZED:
+        return CursorPaginator(follow_feed(user, posts), per_page, **kwargs)
+    return TimelinePaginator(posts, per_page, user, **kwargs)
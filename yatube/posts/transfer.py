@@ -0,0 +1,236 @@
+import gzip
+import json
+import os
+from collections import defaultdict
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import reset_queries, transaction
+from django.utils.dateparse import parse_datetime
+
+from posts import search, timeline
+from posts.batch import insert
+from posts.cache import ALL_FEEDS, bump_feed_version
+from posts.counters import recount
+from posts.models import Comment, Follow, Group, ImportedRecord, Post, User
+from posts.settings import TRANSFER_BATCH_SIZE
+
+EXPORT_FIELDS = {
+    "user": (User, ("username", "first_name", "last_name", "email",
+                    "date_joined")),
+    "group": (Group, ("slug", "title", "description")),
+    "post": (Post, ("id", "author__username", "group__slug", "text",
+                    "pub_date", "image")),
+    "comment": (Comment, ("id", "post", "author__username", "text",
+                          "created")),
+    "follow": (Follow, ("user__username", "author__username")),
+}
+
+
+class DumpEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def open_dump(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, f"{mode}t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def export_records():
+    for kind, (model, fields) in EXPORT_FIELDS.items():
+        keys = [field.split("__")[0] for field in fields]
+        rows = model.objects.order_by("pk").values_list(*fields)
+        for row in rows.iterator(chunk_size=TRANSFER_BATCH_SIZE):
+            yield {"model": kind, **dict(zip(keys, row))}
+
+
+def export_dump(stream):
+    count = 0
+    for record in export_records():
+        stream.write(json.dumps(record, cls=DumpEncoder,
+                                ensure_ascii=False))
+        stream.write("\n")
+        count += 1
+    return count
+
+
+def resolve(model, field, values):
+    return dict(model.objects.filter(
+        **{f"{field}__in": set(values) - {None}}
+    ).values_list(field, "pk"))
+
+
+def imported(kind, source_ids):
+    return dict(ImportedRecord.objects.filter(
+        kind=kind, source_id__in=set(source_ids) - {None}
+    ).values_list("source_id", "target_id"))
+
+
+def remember(kind, records, objects):
+    ImportedRecord.objects.bulk_create(
+        ImportedRecord(kind=kind, source_id=record["id"], target_id=obj.pk)
+        for record, obj in zip(records, objects)
+    )
+
+
+def import_users(records):
+    existing = resolve(User, "username",
+                       (record["username"] for record in records))
+    users = []
+    for record in records:
+        if record["username"] in existing:
+            continue
+        user = User(username=record["username"],
+                    first_name=record["first_name"],
+                    last_name=record["last_name"], email=record["email"],
+                    date_joined=parse_datetime(record["date_joined"]))
+        user.set_unusable_password()
+        users.append(user)
+    User.objects.bulk_create(users)
+    return len(users)
+
+
+def import_groups(records):
+    existing = resolve(Group, "slug", (record["slug"] for record in records))
+    groups = Group.objects.bulk_create(
+        Group(slug=record["slug"], title=record["title"],
+              description=record["description"])
+        for record in records if record["slug"] not in existing
+    )
+    return len(groups)
+
+
+def import_posts(records):
+    authors = resolve(User, "username",
+                      (record["author"] for record in records))
+    groups = resolve(Group, "slug", (record["group"] for record in records))
+    done = imported("post", (record["id"] for record in records))
+    records = [record for record in records
+               if record["id"] not in done and record["author"] in authors]
+    posts = insert(Post, [
+        Post(author_id=authors[record["author"]],
+             group_id=groups.get(record["group"]), text=record["text"],
+             image=record["image"] or "")
+        for record in records
+    ], {})
+    for post, record in zip(posts, records):
+        post.pub_date = parse_datetime(record["pub_date"])
+    Post.objects.bulk_update(posts, ["pub_date"])
+    remember("post", records, posts)
+    search.index_posts(Post.objects.filter(pk__in=[
+        post.pk for post in posts
+    ]))
+    by_author = defaultdict(list)
+    for post in posts:
+        by_author[post.author_id].append(post)
+    for author_id, author_posts in by_author.items():
+        timeline.fan_out_posts(author_id, author_posts)
+    return len(posts)
+
+
+def import_comments(records):
+    authors = resolve(User, "username",
+                      (record["author"] for record in records))
+    posts = imported("post", (record["post"] for record in records))
+    done = imported("comment", (record["id"] for record in records))
+    records = [record for record in records
+               if record["id"] not in done and record["author"] in authors
+               and record["post"] in posts]
+    comments = insert(Comment, [
+        Comment(post_id=posts[record["post"]],
+                author_id=authors[record["author"]], text=record["text"])
+        for record in records
+    ], {})
+    for comment, record in zip(comments, records):
+        comment.created = parse_datetime(record["created"])
+    Comment.objects.bulk_update(comments, ["created"])
+    remember("comment", records, comments)
+    return len(comments)
+
+
+def import_follows(records):
+    users = resolve(User, "username", (
+        username for record in records
+        for username in (record["user"], record["author"])
+    ))
+    pairs = {
+        (users[record["user"]], users[record["author"]])
+        for record in records
+        if record["user"] in users and record["author"] in users
+    }
+    existing = set(Follow.objects.filter(
+        user_id__in={user_id for user_id, author_id in pairs},
+        author_id__in={author_id for user_id, author_id in pairs}
+    ).values_list("user_id", "author_id"))
+    follows = Follow.objects.bulk_create(
+        (Follow(user_id=user_id, author_id=author_id)
+         for user_id, author_id in pairs - existing),
+        ignore_conflicts=True
+    )
+    timeline.backfill_follows(pairs - existing)
+    return len(follows)
+
+
+IMPORTERS = {
+    "user": import_users,
+    "group": import_groups,
+    "post": import_posts,
+    "comment": import_comments,
+    "follow": import_follows,
+}
+
+
+def batches(lines, size):
+    batch = []
+    last = 0
+    for number, line in lines:
+        record = json.loads(line)
+        if batch and (len(batch) == size or
+                      batch[-1]["model"] != record["model"]):
+            yield last, batch
+            batch = []
+        batch.append(record)
+        last = number
+    if batch:
+        yield last, batch
+
+
+def read_checkpoint(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path) as checkpoint:
+        return json.load(checkpoint)["line"]
+
+
+def write_checkpoint(path, line):
+    with open(f"{path}.tmp", "w") as checkpoint:
+        json.dump({"line": line}, checkpoint)
+    os.replace(f"{path}.tmp", path)
+
+
+def import_dump(stream, checkpoint, batch_size=TRANSFER_BATCH_SIZE):
+    start = read_checkpoint(checkpoint)
+    if not start:
+        ImportedRecord.objects.all().delete()
+    lines = (
+        (number, line) for number, line in enumerate(stream, 1)
+        if number > start and line.strip()
+    )
+    created = 0
+    for line, records in batches(lines, batch_size):
+        with transaction.atomic():
+            created += IMPORTERS[records[0]["model"]](records)
+        write_checkpoint(checkpoint, line)
+        reset_queries()
+    with transaction.atomic():
+        recount()
+        timeline.prune_pulled()
+        ImportedRecord.objects.all().delete()
+    bump_feed_version(ALL_FEEDS)
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return start, created
@@ -0,0 +1,90 @@
+from functools import wraps
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from PIL import Image
+
+from posts.settings import MAX_IMAGE_PIXELS, MAX_IMAGE_SIDE, MAX_UPLOAD_SIZE
+
+
+class RejectedUpload(UploadedFile):
+    def __init__(self, name, content_type, size):
+        super().__init__(None, name, content_type, size)
+
+
+class LimitedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.rejected = False
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > MAX_UPLOAD_SIZE:
+            if not self.rejected:
+                self.rejected = True
+                self.file.close()
+            return None
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        if self.rejected:
+            return RejectedUpload(self.file_name, self.content_type,
+                                  self.received)
+        return super().file_complete(file_size)
+
+
+def limit_uploads(view):
+    protected = csrf_protect(view)
+
+    @wraps(view)
+    @csrf_exempt
+    def wrapper(request, *args, **kwargs):
+        request.upload_handlers = [LimitedTemporaryFileUploadHandler(request)]
+        return protected(request, *args, **kwargs)
+    return wrapper
+
+
+def check_image_header(data):
+    if hasattr(data, "temporary_file_path"):
+        source = data.temporary_file_path()
+    else:
+        source = data
+    try:
+        with Image.open(source) as image:
+            width, height = image.size
+    except Image.DecompressionBombError:
+        width = height = None
+    except Exception:
+        return
+    finally:
+        if hasattr(data, "seek"):
+            data.seek(0)
+    if width is None or width * height > MAX_IMAGE_PIXELS:
+        raise ValidationError(
+            "Изображение слишком большое: не более %(pixels)s пикселей.",
+            code="too_many_pixels",
+            params={"pixels": MAX_IMAGE_PIXELS}
+        )
+    if max(width, height) > MAX_IMAGE_SIDE:
+        raise ValidationError(
+            "Сторона изображения не должна превышать %(side)s пикселей.",
+            code="too_wide",
+            params={"side": MAX_IMAGE_SIDE}
+        )
+
+
+class LimitedImageField(forms.ImageField):
+    def to_python(self, data):
+        if isinstance(data, RejectedUpload):
+            raise ValidationError(
+                "Файл слишком большой: не более %(size)s МБ.",
+                code="file_too_large",
+                params={"size": MAX_UPLOAD_SIZE // (1024 * 1024)}
+            )
+        if data:
+            check_image_header(data)
+        return super().to_python(data)
@@ -1,18 +1,26 @@
 from django.urls import path
 
-from posts import views
+from posts import async_views, views
+from posts.settings import ASYNC_VIEWS
+
+read_views = async_views if ASYNC_VIEWS else views
 
 urlpatterns = [
-    path("", views.index, name="index"),
+    path("", read_views.index, name="index"),
     path("new/", views.new_post, name="new_post"),
     path("follow/", views.follow_index, name="follow_index"),
+    path("search/", views.search, name="search"),
+    path("metrics/", views.metrics, name="metrics"),
     path("group/<slug:slug>/", views.group_posts, name="group"),
-    path("<str:username>/", views.profile, name="profile"),
-    path("<str:username>/<int:post_id>/", views.post_view, name="post"),
+    path("<str:username>/", read_views.profile, name="profile"),
+    path("<str:username>/<int:post_id>/", read_views.post_view,
+         name="post"),
     path("<str:username>/<int:post_id>/edit/", views.post_edit,
          name="post_edit"),
     path("<str:username>/<int:post_id>/comment/", views.add_comment,
          name="add_comment"),
+    path("<str:username>/<int:post_id>/comments/", views.post_comments,
+         name="post_comments"),
     path("<str:username>/follow/", views.profile_follow,
          name="profile_follow"),
     path("<str:username>/unfollow/", views.profile_unfollow,
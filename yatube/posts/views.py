@@ -1,16 +1,29 @@
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.db import transaction
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.crypto import constant_time_compare
 
+from posts import graph
+from posts.cache import (feed_fragment, get_cached_page, group_scope,
+                         index_scope, profile_scope, user_scope)
+from posts.conditional import check_modified, conditional_page
 from posts.forms import CommentForm, PostForm
+from posts.metrics import render as render_metrics
 from posts.models import Follow, Group, Post, User
-from posts.settings import POSTS_PER_PAGE
+from posts.paginator import CursorPaginator
+from posts.routers import read_replica
+from posts.search import search_posts
+from posts.settings import (COMMENTS_PER_PAGE, FEED_APPROXIMATE_TOTAL,
+                            METRICS_TOKEN, POSTS_PER_PAGE)
+from posts.timeline import follow_paginator
+from posts.uploads import limit_uploads
 
 
 def is_user_subscribed(user, author):
     return (user != author and
             user.is_authenticated and
-            Follow.objects.filter(user=user, author=author).exists())
+            graph.is_following(user.pk, author.pk))
 
 
 def is_authenticated_user_not_subscribed(user, author):
@@ -18,59 +31,122 @@ def is_authenticated_user_not_subscribed(user, author):
             Follow.objects.filter(user=user, author=author).exists())
 
 
+def get_feed_paginator(posts, key="pub_date", follower=None):
+    options = {"key": key, "approximate_total": FEED_APPROXIMATE_TOTAL}
+    if follower is not None:
+        return follow_paginator(follower, posts, POSTS_PER_PAGE, **options)
+    return CursorPaginator(posts, POSTS_PER_PAGE, **options)
+
+
+def get_feed_page(request, posts, scope=None, key="pub_date",
+                  follower=None):
+    paginator = get_feed_paginator(posts, key, follower)
+    cursor = request.GET.get("cursor")
+    if scope is None:
+        return paginator, paginator.get_page(cursor)
+    return paginator, get_cached_page(paginator, cursor, scope)
+
+
+def get_comments_page(request, comments):
+    paginator = CursorPaginator(comments.select_related("author"),
+                                COMMENTS_PER_PAGE, key="created")
+    return paginator.get_page(request.GET.get("cursor"))
+
+
+@read_replica
+@conditional_page
 def index(request):
-    post_list = Post.objects.select_related("group")
-    paginator = Paginator(post_list, POSTS_PER_PAGE)
-    page_number = request.GET.get("page")
-    page = paginator.get_page(page_number)
+    check_modified(request, index_scope())
+    post_list = Post.objects.for_feed()
+    paginator, page = get_feed_page(request, post_list, index_scope())
     return render(request, "index.html", {
         "page": page,
-        "paginator": paginator
+        "paginator": paginator,
+        "feed_cache": feed_fragment(request, page, index_scope())
     })
 
 
+@read_replica
+@conditional_page
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
-    paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_number = request.GET.get("page")
-    page = paginator.get_page(page_number)
+    scope = group_scope(group.pk)
+    check_modified(request, scope)
+    posts = group.posts.for_feed()
+    paginator, page = get_feed_page(request, posts, scope)
     return render(request, "posts/group.html", {
         "page": page,
         "paginator": paginator,
-        "group": group
+        "group": group,
+        "feed_cache": feed_fragment(request, page, scope)
+    })
+
+
+def search(request):
+    query = request.GET.get("q", "").strip()
+    paginator, page = get_feed_page(request, search_posts(query), key="rank")
+    return render(request, "posts/search.html", {
+        "page": page,
+        "paginator": paginator,
+        "query": query
     })
 
 
+def has_metrics_token(request):
+    return bool(METRICS_TOKEN) and constant_time_compare(
+        request.META.get("HTTP_AUTHORIZATION", ""), f"Bearer {METRICS_TOKEN}"
+    )
+
+
+def metrics(request):
+    if not (request.user.is_staff or has_metrics_token(request)):
+        raise Http404
+    return HttpResponse(render_metrics(),
+                        content_type="text/plain; version=0.0.4")
+
+
 @login_required
+@limit_uploads
 def new_post(request):
-    form = PostForm(request.POST or None)
+    form = PostForm(request.POST or None, files=request.FILES or None)
     if not form.is_valid():
         return render(request, "posts/new_post.html", {"form": form})
     post = form.save(commit=False)
     post.author = request.user
-    post.save()
+    with transaction.atomic():
+        post.save()
     return redirect("index")
 
 
+@read_replica
+@conditional_page
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
-    paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_number = request.GET.get("page")
-    page = paginator.get_page(page_number)
+    author = get_object_or_404(User.objects.select_related("stats"),
+                               username=username)
+    scope = profile_scope(author.pk)
+    check_modified(request, scope, user_scope(author.pk))
+    posts = author.posts.for_feed()
+    paginator, page = get_feed_page(request, posts, scope)
     following = is_user_subscribed(request.user, author)
     return render(request, "posts/profile.html", {
         "page": page,
         "paginator": paginator,
         "author": author,
-        "following": following
+        "following": following,
+        "feed_cache": feed_fragment(request, page, scope)
     })
 
 
+@read_replica
+@conditional_page
 def post_view(request, username, post_id):
-    post = get_object_or_404(Post, author__username=username, pk=post_id)
-    comments = post.comments.all()
+    post = get_object_or_404(
+        Post.objects.for_feed().select_related("author__stats"),
+        author__username=username, pk=post_id
+    )
+    check_modified(request, profile_scope(post.author_id),
+                   user_scope(post.author_id))
+    comments = get_comments_page(request, post.comments.all())
     following = is_user_subscribed(request.user, post.author)
     return render(request, "posts/post.html", {
         "author": post.author,
@@ -81,7 +157,30 @@ def post_view(request, username, post_id):
     })
 
 
+@read_replica
+def post_comments(request, username, post_id):
+    post = get_object_or_404(Post.objects.only("pk"), pk=post_id,
+                             author__username=username)
+    comments = get_comments_page(request, post.comments.all())
+    if request.GET.get("format") == "json":
+        return JsonResponse({
+            "comments": [{
+                "id": comment.pk,
+                "author": comment.author.username,
+                "text": comment.text,
+                "created": comment.created.isoformat()
+            } for comment in comments],
+            "next": comments.next_cursor
+        })
+    return render(request, "posts/include/comment_list.html", {
+        "comments": comments,
+        "username": username,
+        "post_id": post_id
+    })
+
+
 @login_required
+@limit_uploads
 def post_edit(request, username, post_id):
     post = get_object_or_404(Post, author__username=username, pk=post_id)
     if request.user != post.author:
@@ -113,21 +212,23 @@ def add_comment(request, username, post_id):
     if not form.is_valid():
         return render(request, "posts/include/comment.html", {
             "form": form,
-            "comments": post.comments.all()
+            "post": post,
+            "comments": get_comments_page(request, post.comments.all())
         })
     comment = form.save(commit=False)
     comment.author = request.user
     comment.post = post
-    comment.save()
+    with transaction.atomic():
+        comment.save()
     return redirect("post", username=username, post_id=post_id)
 
 
 @login_required
+@read_replica
 def follow_index(request):
-    post_list = Post.objects.filter(author__following__user=request.user)
-    paginator = Paginator(post_list, POSTS_PER_PAGE)
-    page_number = request.GET.get("page")
-    page = paginator.get_page(page_number)
+    post_list = Post.objects.for_feed()
+    paginator, page = get_feed_page(request, post_list,
+                                    follower=request.user)
     return render(request, "posts/follow.html", {
         "page": page,
         "paginator": paginator
@@ -138,7 +239,8 @@ def follow_index(request):
 def profile_follow(request, username):
     author = get_object_or_404(User, username=username)
     if is_authenticated_user_not_subscribed(request.user, author):
-        Follow.objects.create(user=request.user, author=author)
+        with transaction.atomic():
+            Follow.objects.create(user=request.user, author=author)
     return redirect("profile", username=username)
 
 
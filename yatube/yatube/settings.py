@@ -38,6 +38,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "posts.middleware.RequestMetricsMiddleware",
+    "posts.middleware.ReplicaMiddleware",
+    "posts.middleware.PageCacheMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -51,12 +54,22 @@ MIDDLEWARE = [
 ROOT_URLCONF = "yatube.urls"
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+TEMPLATE_CACHE = os.environ.get(
+    "YATUBE_TEMPLATE_CACHE", "0" if DEBUG else "1"
+) == "1"
+TEMPLATE_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "posts.template_backend.TimedDjangoTemplates",
         "DIRS": [TEMPLATES_DIR],
-        "APP_DIRS": True,
         "OPTIONS": {
+            "loaders": (
+                [("django.template.loaders.cached.Loader", TEMPLATE_LOADERS)]
+                if TEMPLATE_CACHE else TEMPLATE_LOADERS
+            ),
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
@@ -69,11 +82,56 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "yatube.wsgi.application"
 
+DATABASE_ENGINES = {
+    "sqlite": "django.db.backends.sqlite3",
+    "postgresql": "django.db.backends.postgresql",
+}
+DATABASE_ENGINE = os.environ.get("YATUBE_DB_ENGINE", "sqlite")
+DATABASE_POOLER = os.environ.get("YATUBE_DB_POOLER", "")
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+        "ENGINE": DATABASE_ENGINES[DATABASE_ENGINE],
+        "NAME": os.environ.get(
+            "YATUBE_DB_NAME",
+            os.path.join(BASE_DIR, "db.sqlite3")
+            if DATABASE_ENGINE == "sqlite" else "yatube"
+        ),
+        "USER": os.environ.get("YATUBE_DB_USER", ""),
+        "PASSWORD": os.environ.get("YATUBE_DB_PASSWORD", ""),
+        "HOST": os.environ.get("YATUBE_DB_HOST", ""),
+        "PORT": os.environ.get("YATUBE_DB_PORT", ""),
+        "CONN_MAX_AGE": int(os.environ.get("YATUBE_DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": (
+            os.environ.get("YATUBE_DB_HEALTH_CHECKS", "1") == "1"
+        ),
+        "DISABLE_SERVER_SIDE_CURSORS": DATABASE_POOLER == "pgbouncer",
+        "OPTIONS": (
+            {"timeout": 20} if DATABASE_ENGINE == "sqlite"
+            else {"connect_timeout": 5}
+        ),
+    }
+}
+
+DATABASE_REPLICAS = [
+    replica for replica in os.environ.get("YATUBE_DB_REPLICAS", "").split(",")
+    if replica
+]
+for number, replica in enumerate(DATABASE_REPLICAS):
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "NAME" if DATABASE_ENGINE == "sqlite" else "HOST": replica,
+        "TEST": {} if DATABASE_ENGINE == "sqlite" else {"MIRROR": "default"},
     }
+
+DATABASE_ROUTERS = ["posts.routers.ReplicaRouter"]
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -20000,
+    "temp_store": "memory",
+    "mmap_size": 128 * 1024 * 1024,
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -91,9 +149,21 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "memcached": "django.core.cache.backends.memcached.MemcachedCache",
+    "redis": "django_redis.cache.RedisCache",
+}
+CACHE_BACKEND = os.environ.get("YATUBE_CACHE_BACKEND", "locmem")
+
 CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": os.environ.get(
+            "YATUBE_CACHE_LOCATION",
+            os.path.join(BASE_DIR, "cache") if CACHE_BACKEND == "file" else ""
+        ),
     }
 }
 
@@ -8,6 +8,7 @@ handler404 = "posts.views.page_404"  # noqa
 handler500 = "posts.views.page_500"  # noqa
 
 urlpatterns = [
+    path("api/v1/", include("posts.api_urls", namespace="api")),
     path("", include("posts.urls")),
     path("auth/", include("users.urls")),
     path("auth/", include("django.contrib.auth.urls")),